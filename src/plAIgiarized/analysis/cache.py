@@ -0,0 +1,92 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from ..logging.service import LoggingService
+
+class AnalysisCache:
+    """Text analysis results persisted across runs, keyed by content hash.
+
+    Entries are tied to a model version so results from an older detector
+    or analysis pipeline are never served, and expire after a TTL.
+    """
+
+    def __init__(self, model_version: str, base_path: str = "database/cache"):
+        self.logger = LoggingService()
+        self.model_version = model_version
+        self.db_path = Path(base_path) / "analysis_cache.db"
+
+        # Cache settings
+        self.settings = {
+            "ttl": 30 * 24 * 3600  # 30 days
+        }
+
+        self._initialize_database()
+
+    def _initialize_database(self) -> None:
+        """Create the cache table; WAL lets readers run alongside a writer."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS analysis_cache (
+                        content_hash TEXT NOT NULL,
+                        model_version TEXT NOT NULL,
+                        result_json TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        PRIMARY KEY (content_hash, model_version)
+                    )
+                """)
+        except Exception as e:
+            self.logger.error("Error initializing analysis cache", e)
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash identifying a text's exact content."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[Dict]]:
+        """Cached result per text, or None where missing or expired."""
+        hashes = [self.content_hash(text) for text in texts]
+        try:
+            found = {}
+            unique = list(set(hashes))
+            with sqlite3.connect(self.db_path) as conn:
+                # Stay well under SQLite's bound parameter limit
+                for start in range(0, len(unique), 500):
+                    chunk = unique[start:start + 500]
+                    rows = conn.execute(
+                        "SELECT content_hash, result_json FROM analysis_cache "
+                        "WHERE model_version = ? AND expires_at > ? "
+                        f"AND content_hash IN ({','.join('?' * len(chunk))})",
+                        [self.model_version, time.time(), *chunk]
+                    )
+                    found.update((key, json.loads(result)) for key, result in rows)
+            return [found.get(key) for key in hashes]
+        except Exception as e:
+            self.logger.error("Error reading analysis cache", e)
+            return [None] * len(texts)
+
+    def put_many(self, texts: List[str], results: List[Dict]) -> None:
+        """Store results for texts; error results are not cached."""
+        expires_at = time.time() + self.settings["ttl"]
+        rows = [
+            (self.content_hash(text), self.model_version, json.dumps(result), expires_at)
+            for text, result in zip(texts, results)
+            if "error" not in result
+        ]
+        if not rows:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analysis_cache "
+                    "(content_hash, model_version, result_json, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        except Exception as e:
+            self.logger.error("Error writing analysis cache", e)
@@ -12,15 +12,28 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from transformers import pipeline
 from ..logging.service import LoggingService
 from ..database.service import DatabaseService
+from ..notification.alert_bus import alert_bus
+from .cache import AnalysisCache
 from datetime import datetime
 from nltk.util import ngrams
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from scipy.stats import entropy
 from textblob import TextBlob
 import math
 
 class AnalysisService:
+    # Threads used to run the detector per text when a batched call fails;
+    # the model releases the GIL during inference
+    MAX_DETECTOR_THREADS = 8
+    # Detector model, and a version to bump whenever the analysis pipeline
+    # changes so persisted results from older code are not reused
+    AI_DETECTOR_MODEL = "roberta-base-openai-detector"
+    # Classifier labels meaning machine-written ("Fake" for the model above)
+    AI_DETECTOR_AI_LABELS = frozenset({"fake", "ai", "label_1"})
+    ANALYSIS_VERSION = 1
+
     def __init__(self):
         self.logger = LoggingService()
         self.db = DatabaseService()
@@ -39,7 +52,7 @@ class AnalysisService:
         try:
             self.ai_detector = pipeline(
                 "text-classification",
-                model="roberta-base-openai-detector",
+                model=self.AI_DETECTOR_MODEL,
                 device=-1  # Use CPU
             )
         except Exception as e:
@@ -63,22 +76,88 @@ class AnalysisService:
             }
         }
 
+        # Text analyses persisted across runs, keyed by content hash
+        self.analysis_cache = AnalysisCache(f"{self.AI_DETECTOR_MODEL}:{self.ANALYSIS_VERSION}")
+
     def analyze_text(self, text: str) -> Dict:
         """Analyze text without storing in database."""
+        cached = self._cached_results([text])[0]
+        if cached is not None:
+            return cached
         try:
             if not self._validate_content(text):
                 raise ValueError("Invalid content length")
             
-            return {
+            result = {
                 "ai_detection": self._detect_ai_content(text),
                 "writing_quality": self._analyze_writing_quality(text),
                 "readability": self._calculate_readability(text),
                 "structure": self._analyze_structure(text)
             }
+            self._cache_results([text], [result])
+            return result
         except Exception as e:
             self.logger.error("Error analyzing text", e)
             return {"error": str(e)}
 
+    def analyze_texts(self, texts: List[str]) -> List[Dict]:
+        """Analyze several texts, running the AI detector as one batch.
+
+        Returns one result per input, shaped like analyze_text. Texts
+        analyzed before, in this or an earlier run, come from the cache.
+        """
+        results = self._cached_results(texts)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            analyzed = self._analyze_texts_uncached(missing_texts)
+            self._cache_results(missing_texts, analyzed)
+            for i, result in zip(missing, analyzed):
+                results[i] = result
+        return results
+
+    def _cached_results(self, texts: List[str]) -> List[Optional[Dict]]:
+        """Persisted result per text, or None where not cached."""
+        if not self.settings["cache_enabled"]:
+            return [None] * len(texts)
+        return self.analysis_cache.get_many(texts)
+
+    def _cache_results(self, texts: List[str], results: List[Dict]) -> None:
+        """Persist results whose AI detection succeeded."""
+        if not self.settings["cache_enabled"]:
+            return
+        pairs = [
+            (text, result) for text, result in zip(texts, results)
+            if "error" not in result and "error" not in result["ai_detection"]
+        ]
+        if pairs:
+            self.analysis_cache.put_many(*map(list, zip(*pairs)))
+
+    def _analyze_texts_uncached(self, texts: List[str]) -> List[Dict]:
+        """Analyze texts with one batched detector call."""
+        results: List[Optional[Dict]] = [None] * len(texts)
+        valid = []
+        for i, text in enumerate(texts):
+            if self._validate_content(text):
+                valid.append(i)
+            else:
+                results[i] = {"error": "Invalid content length"}
+
+        detections = self._detect_ai_content_batch([texts[i] for i in valid])
+        for i, detection in zip(valid, detections):
+            text = texts[i]
+            try:
+                results[i] = {
+                    "ai_detection": detection,
+                    "writing_quality": self._analyze_writing_quality(text),
+                    "readability": self._calculate_readability(text),
+                    "structure": self._analyze_structure(text)
+                }
+            except Exception as e:
+                self.logger.error("Error analyzing text", e)
+                results[i] = {"error": str(e)}
+        return results
+
     def analyze_essay(self, essay_id: str) -> Dict:
         """Perform complete analysis on an essay."""
         try:
@@ -115,6 +194,11 @@ class AnalysisService:
                     "advanced_words_ratio": len([w for w in content_words if len(w) > 6]) / len(content_words) if content_words else 0
                 }
             }
+            alert_bus.publish({
+                "type": "essay_analyzed",
+                "essay_id": essay_id,
+                "ai_detection": analysis["ai_detection"]
+            })
             return analysis
         except Exception as e:
             self.logger.error(f"Error analyzing essay {essay_id}: {str(e)}")
@@ -185,24 +269,7 @@ class AnalysisService:
     def _detect_ai_content(self, content: str) -> Dict:
         """Detect if content is AI generated."""
         try:
-            # Ensure proper result handling
-            result = self.ai_detector(content)
-            if isinstance(result, dict):
-                return {
-                    "is_ai_generated": bool(result.get("is_ai_generated", False)),
-                    "confidence_score": float(result.get("confidence_score", 0.0))
-                }
-            elif isinstance(result, (list, tuple)) and len(result) >= 2:
-                return {
-                    "is_ai_generated": bool(result[0]),
-                    "confidence_score": float(result[1])
-                }
-            else:
-                return {
-                    "is_ai_generated": False,
-                    "confidence_score": 0.0,
-                    "error": "Invalid detector result format"
-                }
+            return self._parse_ai_result(self.ai_detector(content))
         except Exception as e:
             self.logger.error("Error detecting AI content", e)
             return {
@@ -211,6 +278,54 @@ class AnalysisService:
                 "error": str(e)
             }
 
+    def _detect_ai_content_batch(self, contents: List[str]) -> List[Dict]:
+        """Detect AI content for several texts in one detector call."""
+        if not contents:
+            return []
+        try:
+            # A batched call yields one {label, score} dict per text
+            return [self._parse_ai_result(result) for result in self.ai_detector(contents)]
+        except Exception as e:
+            self.logger.error("Error detecting AI content in batch", e)
+            if len(contents) == 1:
+                return [self._detect_ai_content(contents[0])]
+            workers = min(self.MAX_DETECTOR_THREADS, len(contents))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self._detect_ai_content, contents))
+
+    def _parse_ai_result(self, result) -> Dict:
+        """Normalize an AI detector result.
+
+        confidence_score is the probability that the text is AI generated.
+        """
+        # A single-text pipeline call yields a one-item list
+        if isinstance(result, (list, tuple)) and len(result) == 1:
+            result = result[0]
+        if isinstance(result, dict) and "label" in result:
+            score = float(result.get("score", 0.0))
+            if str(result["label"]).lower() not in self.AI_DETECTOR_AI_LABELS:
+                score = 1.0 - score
+            return {
+                "is_ai_generated": score >= 0.5,
+                "confidence_score": score
+            }
+        elif isinstance(result, dict):
+            return {
+                "is_ai_generated": bool(result.get("is_ai_generated", False)),
+                "confidence_score": float(result.get("confidence_score", 0.0))
+            }
+        elif isinstance(result, (list, tuple)) and len(result) >= 2:
+            return {
+                "is_ai_generated": bool(result[0]),
+                "confidence_score": float(result[1])
+            }
+        else:
+            return {
+                "is_ai_generated": False,
+                "confidence_score": 0.0,
+                "error": "Invalid detector result format"
+            }
+
     def _calculate_perplexity(self, text: str) -> float:
         """Calculate text perplexity."""
         try:
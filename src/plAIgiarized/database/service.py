@@ -301,6 +301,44 @@ class DatabaseService:
             self.logger.error(f"Error updating baseline for student {student_id}", e)
             return False
 
+    def get_student_baseline(self, student_id: str) -> Optional[Dict]:
+        """Get student's baseline data, or None if none is stored."""
+        return self.get_student_baselines([student_id]).get(student_id)
+
+    def get_student_baselines(self, student_ids: List[str]) -> Dict[str, Dict]:
+        """Get baseline data for several students in one pass.
+
+        Baseline metrics are returned at the top level next to student_id,
+        samples, metadata and updated_at; students without a stored
+        baseline are left out.
+        """
+        try:
+            unique = list(dict.fromkeys(student_ids))
+            baselines = {}
+            with sqlite3.connect(self.base_path / "plaigiarized.db") as conn:
+                # Stay well under SQLite's bound parameter limit
+                for start in range(0, len(unique), 500):
+                    chunk = unique[start:start + 500]
+                    rows = conn.execute(
+                        "SELECT student_id, metrics, samples, metadata, updated_at "
+                        "FROM student_baselines "
+                        f"WHERE student_id IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    for student_id, metrics, samples, metadata, updated_at in rows:
+                        baselines[student_id] = {
+                            **json.loads(metrics),
+                            "student_id": student_id,
+                            "samples": json.loads(samples),
+                            "metadata": json.loads(metadata) if metadata else {},
+                            "updated_at": updated_at
+                        }
+            return baselines
+
+        except Exception as e:
+            self.logger.error("Error getting student baselines", e)
+            return {}
+
     def _load_collection(self, collection: str) -> List[Dict]:
         """Load collection from file."""
         try:
@@ -1,32 +1,79 @@
-﻿from typing import Dict, List, Optional
+﻿from typing import BinaryIO, Dict, List, Optional, Tuple
 import os
+import time
+import weakref
 from datetime import datetime
-import json
+import orjson
+from types import MappingProxyType
 from ..models.essay import Essay
 
+# Feedback templates
+_TEMPLATES = MappingProxyType({
+    "ai_suspected": (
+        "The writing style shows significant changes from previous work.",
+        "The complexity level appears unusually advanced.",
+        "Please discuss the writing process with the student."
+    ),
+    "improvement_needed": (
+        "Focus on developing more complex sentence structures.",
+        "Work on expanding vocabulary usage.",
+        "Consider adding more detailed examples."
+    ),
+    "positive_progress": (
+        "Shows consistent improvement in writing style.",
+        "Demonstrates good use of vocabulary.",
+        "Maintains clear and coherent structure."
+    )
+})
+
 class FeedbackService:
+    # (metric, threshold, suggestion) - suggested when below threshold
+    _SUGGESTION_RULES = (
+        ("vocabulary_size", 1000, "Consider using more varied vocabulary"),
+        ("sentence_complexity", 5.0, "Try incorporating more complex sentence structures"),
+        ("style_fingerprint", 7.0, "Work on developing a more consistent writing style")
+    )
+
+    # (metric, target, area, priority) - reported when below target
+    _IMPROVEMENT_RULES = (
+        ("grade_level", 8.0, "Grade Level", "high"),
+        ("vocabulary_size", 1000, "Vocabulary", "medium"),
+        ("sentence_complexity", 5.0, "Sentence Structure", "medium")
+    )
+
+    # (metric, threshold, strength) - reported when at or above threshold
+    _STRENGTH_RULES = (
+        ("grade_level", 8.0, "Strong grade-level writing"),
+        ("vocabulary_size", 1000, "Good vocabulary usage"),
+        ("sentence_complexity", 5.0, "Effective sentence structure"),
+        ("style_fingerprint", 7.0, "Consistent writing style")
+    )
+
     def __init__(self):
         self.base_path = "data/feedback"
         os.makedirs(self.base_path, exist_ok=True)
         
-        # Feedback templates
-        self.templates = {
-            "ai_suspected": [
-                "The writing style shows significant changes from previous work.",
-                "The complexity level appears unusually advanced.",
-                "Please discuss the writing process with the student."
-            ],
-            "improvement_needed": [
-                "Focus on developing more complex sentence structures.",
-                "Work on expanding vocabulary usage.",
-                "Consider adding more detailed examples."
-            ],
-            "positive_progress": [
-                "Shows consistent improvement in writing style.",
-                "Demonstrates good use of vocabulary.",
-                "Maintains clear and coherent structure."
-            ]
-        }
+        # fsync each saved file (slower, survives power loss)
+        self.durable_writes = False
+        
+        # Feedback is appended to one JSONL journal per student and flushed
+        # in groups: every N saves, or on the first save after the interval
+        self.journal_flush_every = 32
+        self.journal_flush_interval = 1.0  # seconds
+        self.journal_max_bytes = 8 * 1024 * 1024
+        self._journals: Dict[str, BinaryIO] = {}
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+        # Journals are closed at exit or when the service is collected; the
+        # finalizer holds the journal dict, not the service
+        self._finalizer = weakref.finalize(self, self._close_journals, self._journals)
+        
+        # History per student as serialized records, so callers always get
+        # fresh dicts: ((dir, journal) mtime_ns, limit, records)
+        self._history_cache: Dict[str, Tuple[Tuple[int, int], Optional[int], Tuple[bytes, ...]]] = {}
+        
+        # Feedback templates (shared, read-only)
+        self.templates = _TEMPLATES
 
     def generate_feedback(self, essay: Essay, analysis_results: Dict) -> Dict[str, any]:
         """Generate structured feedback for an essay."""
@@ -69,140 +116,203 @@ class FeedbackService:
             print(f"Error tracking response: {e}")
             return False
 
-    def get_feedback_history(self, student_id: str) -> List[Dict]:
-        """Get feedback history for a student."""
+    def get_feedback_history(self, student_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Get feedback history for a student, most recent first."""
         try:
             history = []
             feedback_dir = os.path.join(self.base_path, student_id)
+            journal_path = self._journal_path(student_id)
+            self._flush_journal(student_id)
             
-            if not os.path.exists(feedback_dir):
+            try:
+                dir_mtime_ns = os.stat(feedback_dir).st_mtime_ns
+            except FileNotFoundError:
                 return history
-                
-            for filename in os.listdir(feedback_dir):
-                if filename.endswith(".json"):
-                    with open(os.path.join(feedback_dir, filename)) as f:
-                        history.append(json.load(f))
+            try:
+                journal_mtime_ns = os.stat(journal_path).st_mtime_ns
+            except FileNotFoundError:
+                journal_mtime_ns = 0
+            stamp = (dir_mtime_ns, journal_mtime_ns)
+            
+            cached = self._history_cache.get(student_id)
+            if cached and cached[0] == stamp:
+                cached_limit = cached[1]
+                if cached_limit is None or (limit is not None and limit <= cached_limit):
+                    return [orjson.loads(record) for record in cached[2][:limit]]
+            
+            # The active journal holds the newest entries. Rotated journals
+            # and older per-feedback files are named feedback_YYYYMMDD_HHMMSS
+            # (rotated ones add a nanosecond suffix), so sorting by name gives
+            # the same order as generated_at and only the requested entries
+            # need to be parsed.
+            with os.scandir(feedback_dir) as it:
+                entries = [
+                    e.path for e in it
+                    if e.name.startswith("feedback_") and e.name.endswith((".json", ".jsonl"))
+                ]
+            entries.sort(reverse=True)
+            if journal_mtime_ns:
+                entries.insert(0, journal_path)
             
-            return sorted(history, key=lambda x: x["generated_at"], reverse=True)
+            records = []
+            for path in entries:
+                if limit is not None and len(records) >= limit:
+                    break
+                with open(path, "rb") as f:
+                    data = f.read()
+                if not path.endswith(".jsonl"):
+                    records.append(data)
+                    continue
+                for line in reversed(data.splitlines()):
+                    if limit is not None and len(records) >= limit:
+                        break
+                    if line:
+                        records.append(line)
+            
+            self._history_cache[student_id] = (stamp, limit, tuple(records))
+            return [orjson.loads(record) for record in records]
         except Exception as e:
             print(f"Error getting feedback history: {e}")
             return []
 
-    def _generate_comments(self, essay: Essay, analysis: Dict) -> List[str]:
+    def _generate_comments(self, essay: Essay, analysis: Dict) -> Tuple[str, ...]:
         """Generate specific comments based on essay analysis."""
-        comments = []
+        comments = ()
         
         # Check for AI usage
         if analysis.get("ai_probability", 0) > 0.7:
-            comments.extend(self.templates["ai_suspected"])
+            comments += _TEMPLATES["ai_suspected"]
         
         # Check grade level
         if essay.metrics["grade_level"] < analysis.get("expected_grade_level", 0):
-            comments.extend(self.templates["improvement_needed"])
+            comments += _TEMPLATES["improvement_needed"]
         
         # Check progress
         if analysis.get("showing_improvement", False):
-            comments.extend(self.templates["positive_progress"])
+            comments += _TEMPLATES["positive_progress"]
         
         return comments
 
     def _generate_suggestions(self, essay: Essay, analysis: Dict) -> List[str]:
         """Generate improvement suggestions."""
-        suggestions = []
-        
-        # Vocabulary suggestions
-        if essay.metrics["vocabulary_size"] < 1000:
-            suggestions.append("Consider using more varied vocabulary")
-            
-        # Complexity suggestions
-        if essay.metrics["sentence_complexity"] < 5.0:
-            suggestions.append("Try incorporating more complex sentence structures")
-            
-        # Style suggestions
-        if essay.metrics["style_fingerprint"] < 7.0:
-            suggestions.append("Work on developing a more consistent writing style")
-        
-        return suggestions
+        metrics = essay.metrics
+        return [
+            suggestion for key, threshold, suggestion in self._SUGGESTION_RULES
+            if metrics[key] < threshold
+        ]
 
     def _identify_improvement_areas(self, essay: Essay) -> List[Dict]:
         """Identify specific areas needing improvement."""
-        areas = []
-        
         metrics = essay.metrics
-        if metrics["grade_level"] < 8.0:
-            areas.append({
-                "area": "Grade Level",
-                "current": metrics["grade_level"],
-                "target": 8.0,
-                "priority": "high"
-            })
-            
-        if metrics["vocabulary_size"] < 1000:
-            areas.append({
-                "area": "Vocabulary",
-                "current": metrics["vocabulary_size"],
-                "target": 1000,
-                "priority": "medium"
-            })
-            
-        if metrics["sentence_complexity"] < 5.0:
-            areas.append({
-                "area": "Sentence Structure",
-                "current": metrics["sentence_complexity"],
-                "target": 5.0,
-                "priority": "medium"
-            })
-        
-        return areas
+        return [
+            {
+                "area": area,
+                "current": current,
+                "target": target,
+                "priority": priority
+            }
+            for key, target, area, priority in self._IMPROVEMENT_RULES
+            if (current := metrics[key]) < target
+        ]
 
     def _identify_strengths(self, essay: Essay) -> List[str]:
         """Identify areas where the student is performing well."""
-        strengths = []
-        
         metrics = essay.metrics
-        if metrics["grade_level"] >= 8.0:
-            strengths.append("Strong grade-level writing")
-            
-        if metrics["vocabulary_size"] >= 1000:
-            strengths.append("Good vocabulary usage")
-            
-        if metrics["sentence_complexity"] >= 5.0:
-            strengths.append("Effective sentence structure")
-            
-        if metrics["style_fingerprint"] >= 7.0:
-            strengths.append("Consistent writing style")
-        
-        return strengths
+        return [
+            strength for key, threshold, strength in self._STRENGTH_RULES
+            if metrics[key] >= threshold
+        ]
+
+    def flush(self) -> None:
+        """Flush all buffered feedback journals to disk."""
+        for student_id in list(self._journals):
+            self._flush_journal(student_id)
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close all feedback journals."""
+        self._finalizer()
+
+    @staticmethod
+    def _close_journals(journals: Dict[str, BinaryIO]) -> None:
+        """Close open journals; closing flushes their buffers."""
+        for journal in journals.values():
+            journal.close()
+        journals.clear()
 
     def _save_feedback(self, feedback: Dict) -> None:
-        """Save feedback to file."""
+        """Append feedback to the student's journal."""
         try:
             student_id = feedback["student_id"]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create student directory if it doesn't exist
-            student_dir = os.path.join(self.base_path, student_id)
-            os.makedirs(student_dir, exist_ok=True)
+            journal = self._journals.get(student_id)
+            if journal is None:
+                # Create student directory if it doesn't exist
+                os.makedirs(os.path.join(self.base_path, student_id), exist_ok=True)
+                journal = open(self._journal_path(student_id), "ab")
+                self._journals[student_id] = journal
+            self._history_cache.pop(student_id, None)
             
-            # Save feedback
-            filename = f"feedback_{timestamp}.json"
-            path = os.path.join(student_dir, filename)
+            journal.write(orjson.dumps(feedback, default=str) + b"\n")
+            self._pending_writes += 1
             
-            with open(path, "w") as f:
-                json.dump(feedback, f, indent=2, default=str)
+            # Group commit
+            if (self._pending_writes >= self.journal_flush_every or
+                    time.monotonic() - self._last_flush >= self.journal_flush_interval):
+                self.flush()
         except Exception as e:
             print(f"Error saving feedback: {e}")
 
+    def _journal_path(self, student_id: str) -> str:
+        """Path of the active feedback journal for a student."""
+        return os.path.join(self.base_path, student_id, "feedback.jsonl")
+
+    def _flush_journal(self, student_id: str) -> None:
+        """Flush one student's journal, rotating it once it grows too large."""
+        journal = self._journals.get(student_id)
+        if journal is None:
+            return
+        
+        journal.flush()
+        if self.durable_writes:
+            os.fsync(journal.fileno())
+        
+        if journal.tell() >= self.journal_max_bytes:
+            journal.close()
+            del self._journals[student_id]
+            # Several rotations can happen within one second
+            now_ns = time.time_ns()
+            stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(now_ns // 1_000_000_000))
+            rotated = f"feedback_{stamp}_{now_ns % 1_000_000_000:09d}.jsonl"
+            os.replace(
+                self._journal_path(student_id),
+                os.path.join(self.base_path, student_id, rotated)
+            )
+
     def _save_response(self, response: Dict) -> None:
         """Save student response to file."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"response_{timestamp}.json"
             path = os.path.join(self.base_path, "responses", filename)
             
             os.makedirs(os.path.join(self.base_path, "responses"), exist_ok=True)
             
-            with open(path, "w") as f:
-                json.dump(response, f, indent=2, default=str)
+            self._write_file(
+                path, orjson.dumps(response, default=str, option=orjson.OPT_INDENT_2)
+            )
         except Exception as e:
             print(f"Error saving response: {e}")
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        """Write a fully serialized payload with a single write() call."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if self.durable_writes:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
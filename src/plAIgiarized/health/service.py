@@ -1,17 +1,31 @@
-﻿from typing import Dict, List, Optional
+﻿from typing import Dict, List, Mapping, Optional
 import os
 import json
+import time
+import asyncio
+import numpy as np
 import psutil
 import platform
 from datetime import datetime
+from types import MappingProxyType
 import threading
 from ..metrics.service import MetricsService
 
 class HealthService:
+    # Environment details are constant for the life of the process, so they
+    # are collected once and shared by every instance
+    _environment_info: Optional[Mapping] = None
+    _environment_lock = threading.Lock()
+
     def __init__(self):
         self.base_path = "data/health"
         os.makedirs(self.base_path, exist_ok=True)
         
+        # Collect environment details in the background while the rest of
+        # the service starts up
+        if HealthService._environment_info is None:
+            threading.Thread(target=self._get_environment_info, daemon=True).start()
+        
         self.metrics_service = MetricsService()
         
         # Health check settings
@@ -22,24 +36,49 @@ class HealthService:
             "error_rate_threshold": 5.0,      # 5% error rate
             "response_time_threshold": 2.0     # 2 seconds
         }
+        self._bind_thresholds()
         
         # Initialize monitoring
         self.monitoring = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_task: Optional[asyncio.Task] = None
         self.monitor_interval = 60  # seconds
+        self._stop_event = threading.Event()
         
-        # Health history
-        self.health_history: List[Dict] = []
+        # Health history as a ring buffer of parallel arrays holding the last
+        # 24 hours of samples; summaries are vectorized over the columns and
+        # get_health_history rebuilds entries from them
+        self.history_size = 24 * 3600 // self.monitor_interval
+        self._history_ts = np.zeros(self.history_size)
+        self._history_cpu = np.zeros(self.history_size)
+        self._history_memory = np.zeros(self.history_size)
+        self._history_disk = np.zeros(self.history_size)
+        self._history_error_rate = np.zeros(self.history_size)
+        self._history_response_time = np.zeros(self.history_size)
+        self._history_warning = np.zeros(self.history_size, dtype=bool)
+        self._history_head = 0
+        self._history_count = 0
         self.history_lock = threading.Lock()
+        
+        # Prime psutil's CPU sampler so later non-blocking reads return the
+        # usage since the previous call instead of sleeping for a sample
+        psutil.cpu_percent(interval=None)
 
     def start_monitoring(self) -> bool:
         """Start health monitoring."""
         try:
             if not self.monitoring:
                 self.monitoring = True
-                self.monitor_thread = threading.Thread(target=self._monitor_health)
-                self.monitor_thread.daemon = True
-                self.monitor_thread.start()
+                self._stop_event.clear()
+                try:
+                    # Share the caller's event loop (e.g. with SyncManager)
+                    # rather than dedicating an OS thread to the monitor
+                    loop = asyncio.get_running_loop()
+                    self.monitor_task = loop.create_task(self._monitor_health_async())
+                except RuntimeError:
+                    self.monitor_thread = threading.Thread(target=self._monitor_health)
+                    self.monitor_thread.daemon = True
+                    self.monitor_thread.start()
                 return True
             return False
         except Exception as e:
@@ -51,8 +90,13 @@ class HealthService:
         try:
             if self.monitoring:
                 self.monitoring = False
+                self._stop_event.set()
+                if self.monitor_task:
+                    self.monitor_task.cancel()
+                    self.monitor_task = None
                 if self.monitor_thread:
                     self.monitor_thread.join(timeout=5)
+                    self.monitor_thread = None
                 return True
             return False
         except Exception as e:
@@ -63,7 +107,7 @@ class HealthService:
         """Get current system health status."""
         try:
             # Get system metrics
-            cpu_usage = psutil.cpu_percent(interval=1)
+            cpu_usage = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
@@ -78,14 +122,14 @@ class HealthService:
                 "system": {
                     "cpu": {
                         "usage": cpu_usage,
-                        "status": "warning" if cpu_usage > self.settings["cpu_warning_threshold"]
+                        "status": "warning" if cpu_usage > self._cpu_threshold
                                 else "healthy"
                     },
                     "memory": {
                         "total": memory.total,
                         "available": memory.available,
                         "used_percent": memory.percent,
-                        "status": "warning" if memory.percent > self.settings["memory_warning_threshold"]
+                        "status": "warning" if memory.percent > self._memory_threshold
                                 else "healthy"
                     },
                     "disk": {
@@ -93,7 +137,7 @@ class HealthService:
                         "used": disk.used,
                         "free": disk.free,
                         "used_percent": disk.percent,
-                        "status": "warning" if disk.percent > self.settings["disk_warning_threshold"]
+                        "status": "warning" if disk.percent > self._disk_threshold
                                 else "healthy"
                     }
                 },
@@ -101,9 +145,9 @@ class HealthService:
                     "error_rate": app_metrics.get("error_rate", 0),
                     "avg_response_time": app_metrics.get("avg_response_time", 0),
                     "status": "warning" if app_metrics.get("error_rate", 0) > 
-                             self.settings["error_rate_threshold"] else "healthy"
+                             self._error_rate_threshold else "healthy"
                 },
-                "environment": self._get_environment_info()
+                "environment": dict(self._get_environment_info())
             }
             
             return health_status
@@ -115,15 +159,74 @@ class HealthService:
         """Get health history for specified period."""
         try:
             with self.history_lock:
-                cutoff_time = datetime.now().timestamp() - (hours * 3600)
-                return [
-                    entry for entry in self.health_history
-                    if datetime.fromisoformat(entry["timestamp"]).timestamp() > cutoff_time
-                ]
+                indices = self._history_window(hours)
+                columns = zip(
+                    self._history_ts[indices].tolist(),
+                    self._history_warning[indices].tolist(),
+                    self._history_cpu[indices].tolist(),
+                    self._history_memory[indices].tolist(),
+                    self._history_disk[indices].tolist(),
+                    self._history_error_rate[indices].tolist(),
+                    self._history_response_time[indices].tolist()
+                )
+            return [
+                {
+                    "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                    "status": "warning" if warning else "healthy",
+                    "system": {
+                        "cpu": {"usage": cpu},
+                        "memory": {"used_percent": memory},
+                        "disk": {"used_percent": disk}
+                    },
+                    "application": {
+                        "error_rate": error_rate,
+                        "avg_response_time": response_time
+                    }
+                }
+                for ts, warning, cpu, memory, disk, error_rate, response_time
+                in columns
+            ]
         except Exception as e:
             print(f"Error getting health history: {e}")
             return []
 
+    def get_health_summary(self, hours: int = 24) -> Dict:
+        """Get aggregate health statistics for specified period."""
+        try:
+            with self.history_lock:
+                indices = self._history_window(hours)
+                if not len(indices):
+                    return {"samples": 0}
+                
+                cpu = self._history_cpu[indices]
+                memory = self._history_memory[indices]
+                disk = self._history_disk[indices]
+                error_rate = self._history_error_rate[indices]
+                return {
+                    "samples": int(len(indices)),
+                    "cpu": {"avg": float(cpu.mean()), "max": float(cpu.max())},
+                    "memory": {"avg": float(memory.mean()), "max": float(memory.max())},
+                    "disk": {"avg": float(disk.mean()), "max": float(disk.max())},
+                    "error_rate": {
+                        "avg": float(error_rate.mean()),
+                        "max": float(error_rate.max())
+                    },
+                    "warnings": int(self._history_warning[indices].sum())
+                }
+        except Exception as e:
+            print(f"Error getting health summary: {e}")
+            return {}
+
+    def update_settings(self, settings: Dict) -> bool:
+        """Update health check settings."""
+        try:
+            self.settings.update(settings)
+            self._bind_thresholds()
+            return True
+        except Exception as e:
+            print(f"Error updating settings: {e}")
+            return False
+
     def check_component_health(self, component: str) -> Dict:
         """Check health of specific component."""
         try:
@@ -150,60 +253,97 @@ class HealthService:
                 health_status = self.get_system_health()
                 
                 # Update health history
-                with self.history_lock:
-                    self.health_history.append(health_status)
-                    
-                    # Keep last 24 hours of history
-                    cutoff_time = datetime.now().timestamp() - (24 * 3600)
-                    self.health_history = [
-                        entry for entry in self.health_history
-                        if datetime.fromisoformat(entry["timestamp"]).timestamp() > cutoff_time
-                    ]
+                if health_status:
+                    self._record_health(time.time(), health_status)
                 
-                # Sleep for monitoring interval
-                for _ in range(self.monitor_interval):
-                    if not self.monitoring:
-                        break
-                    threading.Event().wait(1)
+                # Sleep for monitoring interval (wakes early on stop)
+                if self._stop_event.wait(self.monitor_interval):
+                    break
                     
             except Exception as e:
                 print(f"Error in health monitoring: {e}")
-                threading.Event().wait(self.monitor_interval)
+                if self._stop_event.wait(self.monitor_interval):
+                    break
+
+    async def _monitor_health_async(self) -> None:
+        """Health monitoring task for callers running an asyncio loop."""
+        while self.monitoring:
+            try:
+                health_status = self.get_system_health()
+                if health_status:
+                    self._record_health(time.time(), health_status)
+            except Exception as e:
+                print(f"Error in health monitoring: {e}")
+            
+            await asyncio.sleep(self.monitor_interval)
+
+    def _record_health(self, timestamp: float, health_status: Dict) -> None:
+        """Write a health snapshot into the history ring buffer."""
+        system = health_status["system"]
+        with self.history_lock:
+            i = self._history_head
+            self._history_ts[i] = timestamp
+            self._history_cpu[i] = system["cpu"]["usage"]
+            self._history_memory[i] = system["memory"]["used_percent"]
+            self._history_disk[i] = system["disk"]["used_percent"]
+            self._history_error_rate[i] = health_status["application"]["error_rate"]
+            self._history_response_time[i] = (
+                health_status["application"]["avg_response_time"]
+            )
+            self._history_warning[i] = health_status["status"] != "healthy"
+            
+            self._history_head = (i + 1) % self.history_size
+            self._history_count = min(self._history_count + 1, self.history_size)
+
+    def _history_window(self, hours: float) -> np.ndarray:
+        """Ring-buffer indices of samples newer than the cutoff, oldest first.
+
+        Must be called with history_lock held.
+        """
+        count = self._history_count
+        order = (np.arange(count) + self._history_head - count) % self.history_size
+        cutoff_time = time.time() - (hours * 3600)
+        start = np.searchsorted(self._history_ts[order], cutoff_time, side="right")
+        return order[start:]
+
+    def _bind_thresholds(self) -> None:
+        """Copy thresholds out of settings for the per-sample status checks."""
+        self._cpu_threshold = self.settings["cpu_warning_threshold"]
+        self._memory_threshold = self.settings["memory_warning_threshold"]
+        self._disk_threshold = self.settings["disk_warning_threshold"]
+        self._error_rate_threshold = self.settings["error_rate_threshold"]
+        self._response_time_threshold = self.settings["response_time_threshold"]
 
     def _calculate_overall_status(self, cpu_usage: float, memory_usage: float, 
                                 disk_usage: float, app_metrics: Dict) -> str:
         """Calculate overall system health status."""
         try:
-            # Check system metrics
-            if (cpu_usage > self.settings["cpu_warning_threshold"] or
-                memory_usage > self.settings["memory_warning_threshold"] or
-                disk_usage > self.settings["disk_warning_threshold"]):
+            if (cpu_usage > self._cpu_threshold or
+                memory_usage > self._memory_threshold or
+                disk_usage > self._disk_threshold or
+                app_metrics.get("error_rate", 0) > self._error_rate_threshold or
+                app_metrics.get("avg_response_time", 0) > self._response_time_threshold):
                 return "warning"
-            
-            # Check application metrics
-            error_rate = app_metrics.get("error_rate", 0)
-            response_time = app_metrics.get("avg_response_time", 0)
-            
-            if (error_rate > self.settings["error_rate_threshold"] or
-                response_time > self.settings["response_time_threshold"]):
-                return "warning"
-            
             return "healthy"
         except Exception as e:
             print(f"Error calculating overall status: {e}")
             return "unknown"
 
-    def _get_environment_info(self) -> Dict:
-        """Get information about the system environment."""
-        try:
-            return {
-                "platform": platform.platform(),
-                "python_version": platform.python_version(),
-                "processor": platform.processor(),
-                "machine": platform.machine(),
-                "cores": psutil.cpu_count(),
-                "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat()
-            }
-        except Exception as e:
-            print(f"Error getting environment info: {e}")
-            return {}
+    def _get_environment_info(self) -> Mapping:
+        """Get information about the system environment (cached per process)."""
+        with HealthService._environment_lock:
+            if HealthService._environment_info is not None:
+                return HealthService._environment_info
+            try:
+                HealthService._environment_info = MappingProxyType({
+                    "platform": platform.platform(),
+                    "python_version": platform.python_version(),
+                    "processor": platform.processor(),
+                    "machine": platform.machine(),
+                    "cores": psutil.cpu_count(),
+                    "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat()
+                })
+                return HealthService._environment_info
+            except Exception as e:
+                print(f"Error getting environment info: {e}")
+                return {}
@@ -1,14 +1,41 @@
 from typing import Dict, List, Optional, Union
 import asyncio
 import websockets
-import json
+import orjson
 from datetime import datetime
+import functools
 import hashlib
+import itertools
+import secrets
+import time
 from plAIgiarized.logging.service import LoggingService
 from plAIgiarized.mobile.document_processor.processor import MobileDocumentProcessor
 from plAIgiarized.ai.integration_hub import AIIntegrationHub
 
+@functools.lru_cache(maxsize=1024)
+def _iso_second(seconds: int) -> str:
+    """Format a whole epoch second as a local ISO timestamp."""
+    return datetime.fromtimestamp(seconds).isoformat()
+
+
+def _iso_from_ns(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as ISO with microseconds."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return f"{_iso_second(seconds)}.{remainder // 1000:06d}"
+
+
 class SyncManager:
+    # Sync IDs are a per-process random prefix plus a monotonic counter
+    _id_prefix = secrets.token_hex(4)
+    _id_counter = itertools.count()
+
+    # Slice size used when hashing large sync payloads
+    CHECKSUM_CHUNK_SIZE = 256 * 1024
+    # Named in sync metadata so receivers know how to verify the checksum
+    CHECKSUM_ALGORITHM = "blake2b-256"
+    # Seconds non-priority tasks are collected before a batch is sent
+    BATCH_WINDOW = 0.1
+
     def __init__(self):
         self.logger = LoggingService()
         self.processor = MobileDocumentProcessor()
@@ -23,11 +50,17 @@ class SyncManager:
             "compression": True,
             "encryption": True,
             "delta_sync": True,
-            "priority_sync": True
+            "priority_sync": True,
+            "batch_size": 100,
+            "server_url": None  # websocket endpoint; None keeps sync local
         }
         
         # Initialize components
         self.sync_queue = asyncio.Queue()
+        self.batch_queue: List[Dict] = []
+        # Set when tasks are added to batch_queue
+        self._batch_ready = asyncio.Event()
+        self._ws = None
         self.sync_status = {}
         self.active_syncs = set()
         self.conflict_queue = asyncio.Queue()
@@ -39,6 +72,7 @@ class SyncManager:
         try:
             # Start background tasks
             asyncio.create_task(self._run_sync_loop())
+            asyncio.create_task(self._run_batch_loop())
             asyncio.create_task(self._handle_conflicts())
             asyncio.create_task(self._monitor_connections())
             
@@ -50,6 +84,12 @@ class SyncManager:
                 "user_data": self._sync_user_data,
                 "metadata": self._sync_metadata
             }
+            # Types that can be batched: builders turn a task into the
+            # sync data that _sync_document/_sync_analysis send on their own
+            self.sync_builders = {
+                "document": self._build_document_sync,
+                "analysis": self._build_analysis_sync
+            }
 
         except Exception as e:
             self.logger.error("Error initializing sync", e)
@@ -69,12 +109,13 @@ class SyncManager:
                 "type": item_type,
                 "data": item_data,
                 "priority": priority,
-                "timestamp": datetime.now(),
+                "timestamp": time.time_ns(),
                 "status": "pending"
             }
             
-            # Add to queue
-            if priority and self.settings["priority_sync"]:
+            # Add to queue; without batch sync every task is sent alone
+            if (priority and self.settings["priority_sync"]) or \
+               not self.settings["batch_sync"]:
                 await self.sync_queue.put(task)
             else:
                 await self._add_to_batch(task)
@@ -90,55 +131,55 @@ class SyncManager:
         return self.sync_status.get(task_id)
 
     async def _run_sync_loop(self):
-        """Run main sync loop."""
+        """Run main sync loop for individually sent tasks."""
         while True:
             try:
-                # Process sync queue
-                while not self.sync_queue.empty():
-                    task = await self.sync_queue.get()
-                    
-                    if task["type"] in self.sync_handlers:
-                        result = await self.sync_handlers[task["type"]](task)
-                    else:
-                        result = {"error": "Unknown sync type"}
-                    
-                    self.sync_status[task["id"]] = result
-                    self.sync_queue.task_done()
-                
-                # Run batch sync if enabled
-                if self.settings["batch_sync"]:
-                    await self._process_batch_sync()
-                
-                await asyncio.sleep(self.settings["sync_interval"])
+                # Block until a task arrives, then process it and anything
+                # queued behind it
+                task = await self.sync_queue.get()
+                while task is not None:
+                    await self._process_sync_task(task)
+                    try:
+                        task = self.sync_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        task = None
 
             except Exception as e:
                 self.logger.error("Error in sync loop", e)
                 await asyncio.sleep(60)
 
+    async def _run_batch_loop(self):
+        """Send batched tasks shortly after they arrive."""
+        while True:
+            try:
+                await self._batch_ready.wait()
+                # Tasks arriving within the window share one frame
+                await asyncio.sleep(self.BATCH_WINDOW)
+                self._batch_ready.clear()
+                while self.batch_queue:
+                    await self._process_batch_sync()
+
+            except Exception as e:
+                self.logger.error("Error in batch sync loop", e)
+                await asyncio.sleep(60)
+
+    async def _process_sync_task(self, task: Dict):
+        """Run the handler for a single queued sync task."""
+        try:
+            if task["type"] in self.sync_handlers:
+                result = await self.sync_handlers[task["type"]](task)
+            else:
+                result = {"error": "Unknown sync type"}
+            
+            self.sync_status[task["id"]] = result
+        finally:
+            self.sync_queue.task_done()
+
     async def _sync_document(self, task: Dict) -> Dict:
         """Sync document data."""
         try:
-            # Process document
-            processed = await self.processor.process_document(
-                task["data"]["document"]
-            )
-            
-            # Generate sync data
-            sync_data = {
-                "document_id": task["data"].get("id"),
-                "processed_data": processed,
-                "metadata": self._generate_metadata(task),
-                "timestamp": datetime.now()
-            }
-            
-            # Send sync data
-            result = await self._send_sync_data(sync_data)
-            
-            return {
-                "task_id": task["id"],
-                "status": "completed",
-                "result": result
-            }
+            sync_data = await self._build_document_sync(task)
+            return await self._send_sync_item(task, sync_data)
 
         except Exception as e:
             self.logger.error("Error syncing document", e)
@@ -151,25 +192,8 @@ class SyncManager:
     async def _sync_analysis(self, task: Dict) -> Dict:
         """Sync analysis data."""
         try:
-            # Get analysis results
-            analysis = await self.ai_hub.process_document(task["data"])
-            
-            # Generate sync data
-            sync_data = {
-                "analysis_id": task["data"].get("id"),
-                "analysis_results": analysis,
-                "metadata": self._generate_metadata(task),
-                "timestamp": datetime.now()
-            }
-            
-            # Send sync data
-            result = await self._send_sync_data(sync_data)
-            
-            return {
-                "task_id": task["id"],
-                "status": "completed",
-                "result": result
-            }
+            sync_data = await self._build_analysis_sync(task)
+            return await self._send_sync_item(task, sync_data)
 
         except Exception as e:
             self.logger.error("Error syncing analysis", e)
@@ -179,6 +203,39 @@ class SyncManager:
                 "error": str(e)
             }
 
+    async def _build_document_sync(self, task: Dict) -> Dict:
+        """Process a document task into its sync data."""
+        processed = await self.processor.process_document(
+            task["data"]["document"]
+        )
+        return {
+            "document_id": task["data"].get("id"),
+            "processed_data": processed,
+            "timestamp": _iso_from_ns(time.time_ns())
+        }
+
+    async def _build_analysis_sync(self, task: Dict) -> Dict:
+        """Analyze an analysis task into its sync data."""
+        analysis = await self.ai_hub.process_document(task["data"])
+        return {
+            "analysis_id": task["data"].get("id"),
+            "analysis_results": analysis,
+            "timestamp": _iso_from_ns(time.time_ns())
+        }
+
+    async def _send_sync_item(self, task: Dict, sync_data: Dict) -> Dict:
+        """Send one task's sync data in its own frame."""
+        payload = self._serialize_sync_data(sync_data)
+        metadata = self._generate_metadata(
+            task, payload, sync_data["timestamp"]
+        )
+        result = await self._send_sync_data(metadata, payload)
+        return {
+            "task_id": task["id"],
+            "status": "completed",
+            "result": result
+        }
+
     async def _handle_conflicts(self):
         """Handle sync conflicts."""
         while True:
@@ -218,14 +275,10 @@ class SyncManager:
     async def _process_batch_sync(self):
         """Process batch sync operations."""
         try:
-            batch_items = []
-            batch_size = 0
-            
             # Collect batch items
-            while not self.sync_queue.empty() and batch_size < 100:
-                item = await self.sync_queue.get()
-                batch_items.append(item)
-                batch_size += 1
+            batch_size = self.settings["batch_size"]
+            batch_items = self.batch_queue[:batch_size]
+            del self.batch_queue[:batch_size]
             
             if batch_items:
                 # Process batch
@@ -238,37 +291,140 @@ class SyncManager:
         except Exception as e:
             self.logger.error("Error processing batch sync", e)
 
+    async def _add_to_batch(self, task: Dict):
+        """Queue a non-priority task and wake the batch loop."""
+        self.batch_queue.append(task)
+        self._batch_ready.set()
+
+    async def _sync_batch(self, batch_items: List[Dict]) -> List[Dict]:
+        """Sync a batch of tasks with a single send.
+
+        Each task is built by its type's builder first; tasks that cannot
+        be built get an error status and are left out of the frame.
+        """
+        results: Dict[str, Dict] = {}
+        buildable = []
+        for item in batch_items:
+            if item["type"] in self.sync_builders:
+                buildable.append(item)
+            else:
+                results[item["id"]] = {
+                    "task_id": item["id"],
+                    "status": "error",
+                    "error": "Unknown sync type"
+                }
+
+        built = await asyncio.gather(
+            *(self.sync_builders[item["type"]](item) for item in buildable),
+            return_exceptions=True
+        )
+        sent = []
+        for item, sync_data in zip(buildable, built):
+            if isinstance(sync_data, Exception):
+                self.logger.error(f"Error building {item['type']} sync", sync_data)
+                results[item["id"]] = {
+                    "task_id": item["id"],
+                    "status": "error",
+                    "error": str(sync_data)
+                }
+            else:
+                sent.append((item, sync_data))
+
+        if sent:
+            result = await self._send_sync_batch([
+                {"task_id": item["id"], "type": item["type"], "sync_data": sync_data}
+                for item, sync_data in sent
+            ])
+            status = "error" if "error" in result else "completed"
+            for item, _ in sent:
+                results[item["id"]] = {
+                    "task_id": item["id"], "status": status, "result": result
+                }
+
+        return [results[item["id"]] for item in batch_items]
+
     def _generate_sync_id(self) -> str:
         """Generate unique sync ID."""
-        timestamp = datetime.now().timestamp()
-        unique = f"{timestamp}_{id(self)}"
-        return hashlib.md5(unique.encode()).hexdigest()
+        return f"{self._id_prefix}{next(self._id_counter):012x}"
 
-    def _generate_metadata(self, task: Dict) -> Dict:
-        """Generate sync metadata."""
+    def _generate_metadata(self, task: Dict, payload: bytes,
+                           timestamp: Optional[str] = None) -> Dict:
+        """Generate sync metadata for an already serialized payload."""
         return {
             "sync_id": task["id"],
-            "timestamp": datetime.now().isoformat(),
-            "version": "1.0",
-            "checksum": self._calculate_checksum(task["data"])
+            "timestamp": timestamp or _iso_from_ns(time.time_ns()),
+            # 1.1: checksum is BLAKE2b-256 (was SHA-256 in 1.0)
+            "version": "1.1",
+            "checksum_algorithm": self.CHECKSUM_ALGORITHM,
+            "checksum": self._calculate_checksum(payload)
         }
 
-    def _calculate_checksum(self, data: Dict) -> str:
-        """Calculate data checksum."""
-        return hashlib.sha256(
-            json.dumps(data, sort_keys=True).encode()
-        ).hexdigest()
-
-    async def _send_sync_data(self, data: Dict) -> Dict:
-        """Send sync data to server."""
+    def _serialize_sync_data(self, data: Dict) -> bytes:
+        """Serialize sync data once; the bytes are both hashed and sent."""
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
+
+    def _calculate_checksum(self, payload: bytes) -> str:
+        """Calculate integrity checksum (BLAKE2b-256) of serialized data."""
+        # Feed large payloads in cache-sized slices of the same buffer
+        hasher = hashlib.blake2b(digest_size=32)
+        view = memoryview(payload)
+        for offset in range(0, len(view), self.CHECKSUM_CHUNK_SIZE):
+            hasher.update(view[offset:offset + self.CHECKSUM_CHUNK_SIZE])
+        return hasher.hexdigest()
+
+    def _build_envelope(self, metadata: Dict, payload: bytes) -> bytes:
+        """Wrap serialized sync data and its metadata in one JSON frame."""
+        # The payload is spliced in as-is, so the checksum covers the exact
+        # bytes the receiver finds under "payload"
+        return b"".join((
+            b'{"metadata":', orjson.dumps(metadata, default=str),
+            b',"payload":', payload, b"}"
+        ))
+
+    async def _send_sync_data(self, metadata: Dict, payload: bytes) -> Dict:
+        """Send serialized sync data and its metadata to server."""
         try:
-            # Implement actual sync data transmission
-            return {"status": "sent", "timestamp": datetime.now()}
+            if self.settings["server_url"]:
+                await self._send_payload(self._build_envelope(metadata, payload))
+            return {"status": "sent", "timestamp": time.time_ns()}
 
         except Exception as e:
             self.logger.error("Error sending sync data", e)
             return {"error": str(e)}
 
+    async def _send_sync_batch(self, items: List[Dict]) -> Dict:
+        """Send several sync items in one frame with a single checksum."""
+        payload = self._serialize_sync_data({"batch": items})
+        metadata = self._generate_metadata(
+            {"id": self._generate_sync_id()}, payload
+        )
+        result = await self._send_sync_data(metadata, payload)
+        if "error" not in result:
+            result["checksum"] = metadata["checksum"]
+        return result
+
+    async def _ensure_ws(self):
+        """Open the sync connection once and reuse it across sends."""
+        if self._ws is None:
+            self._ws = await websockets.connect(self.settings["server_url"])
+        return self._ws
+
+    async def _send_payload(self, payload: bytes):
+        """Send a payload over the shared connection, reconnecting once."""
+        ws = await self._ensure_ws()
+        try:
+            await ws.send(payload)
+        except websockets.ConnectionClosed:
+            self._ws = None
+            ws = await self._ensure_ws()
+            await ws.send(payload)
+
+    async def close(self):
+        """Close the shared sync connection."""
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+
     async def _check_connection(self, sync_id: str) -> bool:
         """Check sync connection status."""
         try:
@@ -1,12 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import heapq
 import json
-from datetime import datetime, timedelta
+import time
+import weakref
+import orjson
+from dataclasses import dataclass
+from datetime import datetime
 from ..learning.teacher_preferences import TeacherPreferencesService
 from ..logging.service import LoggingService
 
+@dataclass(slots=True)
+class WidgetState:
+    uses: int = 0
+    last_used: float = 0.0  # time.monotonic() seconds, 0.0 if never used
+    position: Optional[int] = None
+    widget: Optional[tk.Widget] = None
+    label: str = ""
+
 class AdaptiveDashboard:
+    RECENT_USE_SECONDS = 1800
+    # Delay used to coalesce bursts of adaptation requests into one layout pass
+    ADAPT_DELAY_MS = 250
+
+    # Delay used to batch preference saves triggered by usage tracking
+    PREFS_FLUSH_DELAY_MS = 5000
+
     def __init__(self, parent=None, teacher_id: str = None):
         self.logger = LoggingService()
         self.preferences = TeacherPreferencesService()
@@ -18,16 +38,18 @@ class AdaptiveDashboard:
         self.window.geometry("1200x800")
         
         # Widget tracking
-        self.widgets = {
-            "grade_essays": {"uses": 0, "last_used": None, "position": None},
-            "ai_detection": {"uses": 0, "last_used": None, "position": None},
-            "student_progress": {"uses": 0, "last_used": None, "position": None},
-            "class_overview": {"uses": 0, "last_used": None, "position": None},
-            "recent_alerts": {"uses": 0, "last_used": None, "position": None},
-            "quick_actions": {"uses": 0, "last_used": None, "position": None},
-            "reports": {"uses": 0, "last_used": None, "position": None},
-            "handwriting_scan": {"uses": 0, "last_used": None, "position": None}
+        self.widgets: Dict[str, WidgetState] = {
+            "grade_essays": WidgetState(),
+            "ai_detection": WidgetState(),
+            "student_progress": WidgetState(),
+            "class_overview": WidgetState(),
+            "recent_alerts": WidgetState(),
+            "quick_actions": WidgetState(),
+            "reports": WidgetState(),
+            "handwriting_scan": WidgetState()
         }
+        for name, state in self.widgets.items():
+            state.label = name.replace("_", " ").title()
         
         # Layout settings
         self.layout = {
@@ -36,6 +58,21 @@ class AdaptiveDashboard:
             "widget_height": 200,
             "min_uses": 5  # Minimum uses before adapting
         }
+        self._last_positions: Dict[str, tuple] = {}
+        self._adapt_pending = None
+        self._last_order = None
+        self._prefs_dirty = False
+        self._prefs_flush_id = None
+        self._last_prefs_blob: Optional[bytes] = None
+        self._customize_order: List[str] = []
+        self._ordered_names: List[str] = []
+        # Set when the cached usage order changed since the last layout pass
+        self._order_dirty = False
+        self._after_id = None
+        self._positions: tuple = ()
+        self._positions_columns = None
+        # Called with the widget name after each tracked use
+        self._observers: List[Callable[[str], None]] = []
         
         self._create_interface()
         self._load_preferences()
@@ -72,6 +109,12 @@ class AdaptiveDashboard:
             command=self._toggle_adaptation
         ).pack(side=tk.LEFT, padx=5)
 
+        self.status_var = tk.StringVar()
+        ttk.Label(
+            customize_frame,
+            textvariable=self.status_var
+        ).pack(side=tk.RIGHT, padx=5)
+
         # Create grid for widgets
         self.grid_frame = ttk.Frame(self.main)
         self.grid_frame.pack(fill=tk.BOTH, expand=True)
@@ -80,20 +123,22 @@ class AdaptiveDashboard:
         self._create_widgets()
 
     def _create_widgets(self):
-        """Create all dashboard widgets."""
-        # Clear existing widgets
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-
-        # Create and position widgets based on current layout
-        self._create_grade_essays_widget()
-        self._create_ai_detection_widget()
-        self._create_student_progress_widget()
-        self._create_class_overview_widget()
-        self._create_alerts_widget()
-        self._create_quick_actions_widget()
-        self._create_reports_widget()
-        self._create_handwriting_widget()
+        """Create any missing dashboard widgets and position them."""
+        builders = {
+            "grade_essays": self._create_grade_essays_widget,
+            "ai_detection": self._create_ai_detection_widget,
+            "student_progress": self._create_student_progress_widget,
+            "class_overview": self._create_class_overview_widget,
+            "recent_alerts": self._create_alerts_widget,
+            "quick_actions": self._create_quick_actions_widget,
+            "reports": self._create_reports_widget,
+            "handwriting_scan": self._create_handwriting_widget
+        }
+
+        # Widgets are built once and kept; later calls only re-grid them
+        for name, build in builders.items():
+            if self.widgets[name].widget is None:
+                build()
 
         # Apply current layout
         self._apply_layout()
@@ -121,7 +166,7 @@ class AdaptiveDashboard:
         listbox = tk.Listbox(recent_frame, height=5)
         listbox.pack(fill=tk.BOTH, expand=True)
 
-        self.widgets["grade_essays"]["widget"] = frame
+        self.widgets["grade_essays"].widget = frame
 
     def _create_ai_detection_widget(self):
         """Create AI detection widget."""
@@ -145,7 +190,7 @@ class AdaptiveDashboard:
             command=lambda: self._track_usage("ai_detection")
         ).pack(fill=tk.X)
 
-        self.widgets["ai_detection"]["widget"] = frame
+        self.widgets["ai_detection"].widget = frame
 
     def _create_student_progress_widget(self):
         """Create student progress widget."""
@@ -170,68 +215,151 @@ class AdaptiveDashboard:
         chart_frame.pack(fill=tk.BOTH, expand=True)
         chart_frame.pack_propagate(False)
 
-        self.widgets["student_progress"]["widget"] = frame
+        self.widgets["student_progress"].widget = frame
 
-    def _apply_layout(self):
-        """Apply current layout to widgets."""
-        # Sort widgets by usage if auto-adapt is on
-        if self.adapt_var.get():
-            sorted_widgets = sorted(
+    def _apply_layout(self, ordered: Optional[List[str]] = None):
+        """Apply current layout to widgets.
+
+        ordered: widget names already in usage order, which skips the sort.
+        """
+        if ordered:
+            sorted_widgets = [(name, self.widgets[name]) for name in ordered]
+        elif self.adapt_var.get():
+            # Sort widgets by usage if auto-adapt is on
+            sorted_widgets = heapq.nlargest(
+                len(self.widgets),
                 self.widgets.items(),
-                key=lambda x: (x[1]["uses"], x[1]["last_used"] or datetime.min),
-                reverse=True
+                key=self._usage_sort_key
             )
+            self._ordered_names = [name for name, _ in sorted_widgets]
         else:
             # Use saved positions or default order
             sorted_widgets = sorted(
                 self.widgets.items(),
-                key=lambda x: x[1]["position"] or float('inf')
+                key=self._position_sort_key
             )
+            self._ordered_names = []
+
+        # Compute the full (widget -> cell) assignment before touching Tk
+        columns = self.layout["columns"]
+        if columns != self._positions_columns:
+            self._update_positions(columns)
+        placed = [(name, state.widget) for name, state in sorted_widgets if state.widget is not None]
 
-        # Position widgets in grid
-        row = 0
-        col = 0
-        for name, data in sorted_widgets:
-            if "widget" in data:
-                data["widget"].grid(
-                    row=row,
-                    column=col,
-                    padx=self.layout["padding"],
-                    pady=self.layout["padding"],
-                    sticky="nsew"
-                )
-                
-                # Configure grid weights
-                self.grid_frame.grid_columnconfigure(col, weight=1)
-                self.grid_frame.grid_rowconfigure(row, weight=1)
-
-                # Update position
-                col += 1
-                if col >= self.layout["columns"]:
-                    col = 0
-                    row += 1
+        # Nothing to do when the ordering and widgets match the last pass
+        order = (columns, tuple((name, id(widget)) for name, widget in placed))
+        if order == self._last_order:
+            return
+        self._last_order = order
+
+        # Apply all geometry changes in one batch and let Tk solve the
+        # layout once at the end instead of after every widget
+        # Only widgets whose cell changed need to be re-gridded
+        padding = self.layout["padding"]
+        for (name, widget), cell in zip(placed, self._positions):
+            if self._last_positions.get(name) == (widget, cell):
+                continue
+            row, col = cell
+            widget.grid(
+                row=row,
+                column=col,
+                padx=padding,
+                pady=padding,
+                sticky="nsew"
+            )
+            self._last_positions[name] = (widget, cell)
+        self.grid_frame.update_idletasks()
+
+    def _update_positions(self, columns: int):
+        """Precompute grid cells and weights for a column count."""
+        count = len(self.widgets)
+        self._positions = tuple((index // columns, index % columns) for index in range(count))
+        self._positions_columns = columns
+
+        for col in range(min(columns, count)):
+            self.grid_frame.grid_columnconfigure(col, weight=1)
+        for row in range((count + columns - 1) // columns):
+            self.grid_frame.grid_rowconfigure(row, weight=1)
+
+    @staticmethod
+    def _usage_sort_key(item) -> tuple:
+        """Sort key ranking widgets by use count, then most recent use."""
+        state = item[1]
+        return (state.uses, state.last_used)
+
+    @staticmethod
+    def _position_sort_key(item) -> int:
+        """Sort key for saved positions; unplaced widgets go last."""
+        position = item[1].position
+        return position if position is not None else 1 << 30
+
+    def add_observer(self, observer: Callable[[str], None]):
+        """Call observer with the widget name after each tracked use."""
+        self._observers.append(observer)
 
     def _track_usage(self, widget_name: str):
         """Track widget usage for adaptation."""
-        if widget_name in self.widgets:
-            self.widgets[widget_name]["uses"] += 1
-            self.widgets[widget_name]["last_used"] = datetime.now()
+        state = self.widgets.get(widget_name)
+        if state is not None:
+            state.uses += 1
+            state.last_used = time.monotonic()
             
             # Save to preferences
             self._save_preferences()
+
+            # Keep the cached usage order exact on every use, even below
+            # the adaptation threshold or with adaptation off
+            if self._bubble_up(widget_name):
+                self._order_dirty = True
             
-            # Adapt layout if enabled and minimum uses reached
+            # Adapt layout if enabled, minimum uses reached and the usage
+            # order changed since the last layout pass
             if self.adapt_var.get() and \
-               self.widgets[widget_name]["uses"] >= self.layout["min_uses"]:
+               state.uses >= self.layout["min_uses"] and \
+               self._order_dirty:
                 self._adapt_layout()
 
+        for observer in self._observers:
+            observer(widget_name)
+
+    def _bubble_up(self, widget_name: str) -> bool:
+        """Move a just-used widget forward in the cached usage order.
+
+        Only the used widget's key grew, so it can only move towards the
+        front. Returns True when the order changed or is not known yet.
+        """
+        order = self._ordered_names
+        if widget_name not in order:
+            return True
+
+        index = order.index(widget_name)
+        key = self._usage_sort_key((widget_name, self.widgets[widget_name]))
+        start = index
+        while index > 0:
+            previous = order[index - 1]
+            if self._usage_sort_key((previous, self.widgets[previous])) >= key:
+                break
+            order[index] = previous
+            index -= 1
+        order[index] = widget_name
+        return index != start
+
     def _adapt_layout(self):
+        """Schedule a layout adaptation, coalescing bursts of requests."""
+        if not self.adapt_var.get() or self._adapt_pending is not None:
+            return
+
+        self._adapt_pending = self.window.after(self.ADAPT_DELAY_MS, self._do_adapt)
+
+    def _do_adapt(self):
         """Adapt layout based on usage patterns."""
+        self._adapt_pending = None
         if not self.adapt_var.get():
             return
 
-        # Reapply layout with current usage data
-        self._apply_layout()
+        # Reapply layout with the incrementally maintained usage order
+        self._order_dirty = False
+        self._apply_layout(self._ordered_names)
         
         # Notify teacher of adaptation
         self.status_var.set("Dashboard adapted to your usage patterns")
@@ -252,8 +380,9 @@ class AdaptiveDashboard:
         listbox = tk.Listbox(dialog, selectmode=tk.SINGLE)
         listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        for name in self.widgets:
-            listbox.insert(tk.END, name.replace("_", " ").title())
+        # Widget keys in display order; the listbox only mirrors this list
+        self._customize_order = list(self.widgets)
+        self._fill_customize_list(listbox)
 
         # Add move buttons
         btn_frame = ttk.Frame(dialog)
@@ -285,26 +414,29 @@ class AdaptiveDashboard:
             return
 
         index = selection[0]
-        if direction == -1 and index > 0:
-            # Move up
-            text = listbox.get(index)
-            listbox.delete(index)
-            listbox.insert(index-1, text)
-            listbox.selection_set(index-1)
-        elif direction == 1 and index < listbox.size()-1:
-            # Move down
-            text = listbox.get(index)
-            listbox.delete(index)
-            listbox.insert(index+1, text)
-            listbox.selection_set(index+1)
+        target = index + direction
+        if not 0 <= target < len(self._customize_order):
+            return
+
+        # Swap in the backing list, then redraw the listbox once
+        order = self._customize_order
+        order[index], order[target] = order[target], order[index]
+        self._fill_customize_list(listbox)
+        listbox.selection_set(target)
+
+    def _fill_customize_list(self, listbox: tk.Listbox):
+        """Populate the customization listbox from the backing order."""
+        listbox.delete(0, tk.END)
+        listbox.insert(
+            tk.END,
+            *(self.widgets[name].label for name in self._customize_order)
+        )
 
     def _apply_customization(self, listbox: tk.Listbox, dialog: tk.Toplevel):
         """Apply customization changes."""
         # Update widget positions
-        for i in range(listbox.size()):
-            name = listbox.get(i).lower().replace(" ", "_")
-            if name in self.widgets:
-                self.widgets[name]["position"] = i
+        for i, name in enumerate(self._customize_order):
+            self.widgets[name].position = i
 
         # Save preferences
         self._save_preferences()
@@ -316,16 +448,43 @@ class AdaptiveDashboard:
         dialog.destroy()
 
     def _save_preferences(self):
-        """Save current preferences."""
+        """Mark preferences dirty and schedule a batched save."""
         if not self.teacher_id:
             return
 
+        self._prefs_dirty = True
+        if self._prefs_flush_id is None:
+            self._prefs_flush_id = self.window.after(
+                self.PREFS_FLUSH_DELAY_MS, self._flush_preferences
+            )
+
+    def _flush_preferences(self):
+        """Save current preferences if they changed since the last save."""
+        self._prefs_flush_id = None
+        if not self._prefs_dirty or not self.teacher_id:
+            return
+        self._prefs_dirty = False
+
         preferences = {
-            "widgets": self.widgets,
+            "widgets": {
+                name: {
+                    "uses": state.uses,
+                    "last_used": self._monotonic_to_iso(state.last_used),
+                    "position": state.position
+                }
+                for name, state in self.widgets.items()
+            },
             "layout": self.layout,
             "auto_adapt": self.adapt_var.get()
         }
 
+        # Only plain values go into the payload, so it always serializes;
+        # skip the save when nothing actually changed since the last one
+        blob = orjson.dumps(preferences, option=orjson.OPT_SORT_KEYS)
+        if blob == self._last_prefs_blob:
+            return
+        self._last_prefs_blob = blob
+
         self.preferences.learn_from_interaction(
             self.teacher_id,
             {
@@ -334,6 +493,29 @@ class AdaptiveDashboard:
             }
         )
 
+    @staticmethod
+    def _monotonic_to_iso(last_used: float) -> Optional[str]:
+        """Convert a monotonic usage time to a wall-clock ISO timestamp."""
+        if not last_used:
+            return None
+        elapsed = time.monotonic() - last_used
+        return datetime.fromtimestamp(time.time() - elapsed).isoformat()
+
+    @staticmethod
+    def _iso_to_monotonic(value) -> float:
+        """Convert a saved usage time back to monotonic seconds."""
+        if not value:
+            return 0.0
+        try:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elapsed = time.time() - value.timestamp()
+        except (TypeError, ValueError, AttributeError):
+            return 0.0
+        # May be negative for uses older than the monotonic clock's origin;
+        # only ordering and differences matter.
+        return (time.monotonic() - elapsed) or 1e-9
+
     def _load_preferences(self):
         """Load saved preferences."""
         if not self.teacher_id:
@@ -350,7 +532,16 @@ class AdaptiveDashboard:
                 suggestion = suggestions[0]
                 if "preferences" in suggestion:
                     saved_prefs = suggestion["preferences"]
-                    self.widgets.update(saved_prefs.get("widgets", {}))
+                    for name, saved in saved_prefs.get("widgets", {}).items():
+                        state = self.widgets.get(name)
+                        if state is not None:
+                            state.uses = saved.get("uses", state.uses)
+                            last_used = self._iso_to_monotonic(saved.get("last_used"))
+                            if last_used:
+                                state.last_used = last_used
+                            state.position = saved.get("position", state.position)
+                    # Restored usage invalidates the cached usage order
+                    self._ordered_names = []
                     self.layout.update(saved_prefs.get("layout", {}))
                     self.adapt_var.set(saved_prefs.get("auto_adapt", True))
 
@@ -358,25 +549,32 @@ class AdaptiveDashboard:
             self.logger.error("Error loading preferences", e)
 
     def _start_learning(self):
-        """Start dashboard learning process."""
+        """Start dashboard learning process.
+
+        Adaptation is event-driven: _track_usage schedules a layout pass
+        whenever a widget is used, so only a single startup check is needed
+        to pick up recent usage restored from saved preferences.
+        """
+        # The pending callback only holds a weak reference, so a closed
+        # dashboard can be collected even if the check never ran
+        ref = weakref.ref(self)
+
         def check_patterns():
-            if self.adapt_var.get():
-                current_time = datetime.now()
-                
-                # Check for usage patterns
-                for name, data in self.widgets.items():
-                    if data["last_used"]:
-                        time_diff = current_time - data["last_used"]
-                        if time_diff < timedelta(minutes=30):
-                            # Recent usage, might need adaptation
-                            self._adapt_layout()
-                            break
-
-            # Schedule next check
-            self.window.after(60000, check_patterns)  # Check every minute
+            this = ref()
+            if this is None or not this.window.winfo_exists():
+                return
+            this._after_id = None
+            if this.adapt_var.get():
+                now = time.monotonic()
+                if any(
+                    state.last_used and now - state.last_used < this.RECENT_USE_SECONDS
+                    for state in this.widgets.values()
+                ):
+                    # Recent usage, might need adaptation
+                    this._adapt_layout()
 
         # Start initial check
-        self.window.after(1000, check_patterns)
+        self._after_id = self.window.after(1000, check_patterns)
 
     def run(self):
         """Start the dashboard."""
@@ -384,5 +582,14 @@ class AdaptiveDashboard:
 
     def destroy(self):
         """Clean up resources."""
-        self._save_preferences()
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        if self._adapt_pending is not None:
+            self.window.after_cancel(self._adapt_pending)
+            self._adapt_pending = None
+        if self._prefs_flush_id is not None:
+            self.window.after_cancel(self._prefs_flush_id)
+        self._prefs_dirty = True
+        self._flush_preferences()
         self.window.destroy() 
\ No newline at end of file
@@ -1,20 +1,46 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
-from typing import Dict, List
+import importlib
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
 from ..student.service import StudentProgressService
-from ..class.service import ClassProgressService
 from ..analysis.service import AnalysisService
+from .ui_queue import UIQueuePump
 
 class DashboardInterface:
+    # Seconds a class analysis is reused before being recomputed
+    CLASS_CACHE_TTL = 30
+    # How often finished worker results are applied
+    UI_DRAIN_MS = 30
+    # Tk roots whose ttk styles have already been configured
+    _styled_roots = weakref.WeakSet()
+    # Redraw method per tab, looked up by name when the tab is redrawn
+    TAB_UPDATERS = {
+        0: "_update_overview_charts",
+        1: "_update_student_progress",
+        2: "_update_writing_analysis",
+        3: "_update_ai_detection",
+        4: "_update_alerts"
+    }
+
     def __init__(self, root=None):
         self.student_service = StudentProgressService()
-        self.class_service = ClassProgressService()
+        # "class" is a keyword, so the package can only be loaded by name
+        class_module = importlib.import_module("..class.service", __package__)
+        self.class_service = class_module.ClassProgressService()
         self.analysis_service = AnalysisService()
         
+        # Class analysis results keyed by (class_id, period)
+        self._class_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._pending_refresh = None
+        self._first_tab_job = None
+        
+        # Worker threads keep long analyses off the Tk event loop
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        
         # Create main window if not provided
         if root is None:
             self.root = tk.Tk()
@@ -23,6 +49,11 @@ class DashboardInterface:
         else:
             self.root = root
 
+        # Worker callbacks never touch Tk; results are handed to the Tk
+        # thread through this queue
+        self._ui_pump = UIQueuePump(self.root, self.UI_DRAIN_MS)
+        self._ui_pump.start()
+
         # Create main container
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -37,11 +68,16 @@ class DashboardInterface:
 
     def _configure_styles(self):
         """Configure custom styles for the dashboard."""
-        style = ttk.Style()
+        # Styles live in the Tk interpreter, so configure them once per root
+        tk_root = self.root.nametowidget(".")
+        if tk_root in DashboardInterface._styled_roots:
+            return
+        style = ttk.Style(tk_root)
         style.configure("Dashboard.TFrame", background="#f0f0f0")
         style.configure("Header.TLabel", font=("Arial", 16, "bold"))
         style.configure("Navigation.TButton", font=("Arial", 10))
         style.configure("Alert.TLabel", foreground="red", font=("Arial", 10, "bold"))
+        DashboardInterface._styled_roots.add(tk_root)
 
     def _create_header(self):
         """Create dashboard header with class selection and date range."""
@@ -64,7 +100,8 @@ class DashboardInterface:
         period_combo.bind('<<ComboboxSelected>>', self._on_period_change)
 
         # Refresh button
-        ttk.Button(header_frame, text="Refresh", command=self._refresh_dashboard).pack(side=tk.RIGHT)
+        ttk.Button(header_frame, text="Refresh",
+                  command=lambda: self._refresh_dashboard(force=True)).pack(side=tk.RIGHT)
 
     def _create_navigation(self):
         """Create navigation sidebar."""
@@ -106,12 +143,84 @@ class DashboardInterface:
         self.notebook.add(self.ai_detection_frame, text="AI Detection")
         self.notebook.add(self.alerts_frame, text="Alerts")
 
-        # Initialize views
-        self._initialize_overview()
-        self._initialize_student_progress()
-        self._initialize_writing_analysis()
-        self._initialize_ai_detection()
-        self._initialize_alerts()
+        # Tab contents (and their figures) are built on first view
+        self._tab_initializers = {
+            0: self._initialize_overview,
+            1: self._initialize_student_progress,
+            2: self._initialize_writing_analysis,
+            3: self._initialize_ai_detection,
+            4: self._initialize_alerts
+        }
+        self._tab_initialized = set()
+
+        # Refreshing redraws only the visible tab; other tabs are marked
+        # dirty and redrawn when they are next shown
+        self._tab_dirty = set()
+        self._class_data = None
+
+        # One figure and canvas are shared by all chart tabs; the canvas is
+        # moved into the visible tab's chart frame on tab change
+        self.shared_fig = None
+        self.shared_canvas = None
+        self._chart_hosts: Dict[int, ttk.Frame] = {}
+
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_change)
+        # The first tab is built once the window is up; the shared figure
+        # waits until a chart is actually drawn
+        self._first_tab_job = self.root.after_idle(self._show_first_tab)
+
+    def _show_first_tab(self):
+        """Build the tab selected at startup."""
+        self._first_tab_job = None
+        self._on_tab_change()
+
+    def _on_tab_change(self, event=None):
+        """Initialize the selected tab on first view and redraw it if stale."""
+        index = self.notebook.index('current')
+        if index not in self._tab_initialized:
+            self._tab_initialized.add(index)
+            self._tab_initializers[index]()
+
+        host = self._chart_hosts.get(index)
+        if host is not None and self.shared_canvas is not None:
+            # The shared figure still holds the previous tab's chart
+            if self._class_data is not None:
+                self._tab_dirty.add(index)
+            else:
+                self._show_shared_canvas(host)
+                self.shared_fig.clear()
+                self.shared_canvas.draw_idle()
+
+        if index in self._tab_dirty:
+            self._update_tab(index)
+
+    def _show_shared_canvas(self, host: ttk.Frame):
+        """Pack the shared chart canvas into a tab's chart frame."""
+        if self.shared_canvas is None:
+            # matplotlib is imported on first chart use to keep startup fast
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.shared_fig = Figure(figsize=(10, 6))
+            # Parented to the notebook so it can be packed into any tab
+            self.shared_canvas = FigureCanvasTkAgg(self.shared_fig, self.notebook)
+
+        widget = self.shared_canvas.get_tk_widget()
+        widget.pack_forget()
+        widget.pack(in_=host, fill=tk.BOTH, expand=True)
+
+    def _update_tab(self, index: int):
+        """Redraw a single tab with the current class data."""
+        self._tab_dirty.discard(index)
+        host = self._chart_hosts.get(index)
+        if host is not None:
+            # Creates the shared figure on the first chart drawn
+            self._show_shared_canvas(host)
+        updater = getattr(self, self.TAB_UPDATERS[index])
+        if index == 0:
+            updater(self._class_data)
+        else:
+            updater()
 
     def _initialize_overview(self):
         """Initialize class overview tab."""
@@ -123,10 +232,7 @@ class DashboardInterface:
         charts_frame = ttk.Frame(self.overview_frame)
         charts_frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
-        # Create figure for charts
-        self.overview_fig = plt.Figure(figsize=(10, 6))
-        canvas = FigureCanvasTkAgg(self.overview_fig, charts_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._chart_hosts[0] = charts_frame
 
     def _initialize_student_progress(self):
         """Initialize student progress tab."""
@@ -141,9 +247,7 @@ class DashboardInterface:
         self.student_combo.bind('<<ComboboxSelected>>', self._on_student_change)
 
         # Progress visualization
-        self.student_fig = plt.Figure(figsize=(10, 6))
-        canvas = FigureCanvasTkAgg(self.student_fig, self.students_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._chart_hosts[1] = self.students_frame
 
     def _initialize_writing_analysis(self):
         """Initialize writing analysis tab."""
@@ -152,9 +256,7 @@ class DashboardInterface:
         metrics_frame.pack(fill=tk.X, pady=5)
 
         # Trend visualization
-        self.analysis_fig = plt.Figure(figsize=(10, 6))
-        canvas = FigureCanvasTkAgg(self.analysis_fig, self.analysis_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._chart_hosts[2] = self.analysis_frame
 
     def _initialize_ai_detection(self):
         """Initialize AI detection tab."""
@@ -163,9 +265,7 @@ class DashboardInterface:
         stats_frame.pack(fill=tk.X, pady=5)
 
         # Detection visualization
-        self.ai_fig = plt.Figure(figsize=(10, 6))
-        canvas = FigureCanvasTkAgg(self.ai_fig, self.ai_detection_frame)
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._chart_hosts[3] = self.ai_detection_frame
 
     def _initialize_alerts(self):
         """Initialize alerts tab."""
@@ -195,26 +295,54 @@ class DashboardInterface:
         }
         self.notebook.select(view_index.get(view_name, 0))
 
-    def _refresh_dashboard(self):
+    def _refresh_dashboard(self, force: bool = False):
         """Refresh all dashboard data."""
         try:
             class_id = self.class_var.get()
             if not class_id:
                 return
 
-            # Update class data
-            class_data = self.class_service.analyze_class_progress(class_id)
-            
-            # Update visualizations
-            self._update_overview_charts(class_data)
-            self._update_student_progress()
-            self._update_writing_analysis()
-            self._update_ai_detection()
-            self._update_alerts()
+            # Reuse a recent analysis for the same class and period
+            key = (class_id, self.period_var.get())
+            self._pending_refresh = key
+            cached = self._class_cache.get(key)
+            if not force and cached and time.monotonic() - cached[0] < self.CLASS_CACHE_TTL:
+                self._apply_refresh(cached[1])
+                return
+
+            # Analyze off the Tk thread; the result is queued for the Tk thread
+            future = self._executor.submit(self.class_service.analyze_class_progress, class_id)
+            future.add_done_callback(
+                lambda f: self._ui_pump.post(self._on_class_progress, key, f)
+            )
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh dashboard: {str(e)}")
 
+    def _on_class_progress(self, key: Tuple[str, str], future: Future):
+        """Receive a finished class analysis on the Tk thread."""
+        try:
+            class_data = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to refresh dashboard: {str(e)}")
+            return
+
+        self._class_cache[key] = (time.monotonic(), class_data)
+
+        # Ignore results superseded by a later class/period selection
+        if key == self._pending_refresh:
+            self._apply_refresh(class_data)
+
+    def _apply_refresh(self, class_data):
+        """Show new class data in the dashboard."""
+        self._class_data = class_data
+
+        # Update visualizations: redraw the visible tab now, the rest
+        # when they are selected, then let Tk settle once
+        self._tab_dirty = set(self.TAB_UPDATERS)
+        self._update_tab(self.notebook.index('current'))
+        self.root.update_idletasks()
+
     def run(self):
         """Start the dashboard interface."""
         if isinstance(self.root, tk.Tk):
@@ -222,5 +350,10 @@ class DashboardInterface:
 
     def destroy(self):
         """Clean up resources."""
+        self._executor.shutdown(wait=False)
+        self._ui_pump.stop()
+        if self._first_tab_job is not None:
+            self.root.after_cancel(self._first_tab_job)
+            self._first_tab_job = None
         if isinstance(self.root, tk.Tk):
             self.root.destroy() 
\ No newline at end of file
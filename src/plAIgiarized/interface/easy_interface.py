@@ -2,25 +2,89 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 from typing import Dict, List
-import threading
-from ..document.service import DocumentProcessingService
-from ..analysis.service import AnalysisService
-from ..student.service import StudentProgressService
-from ..class.service import ClassProgressService
+import os
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+
+REPORT_TYPES = ("Class Overview", "Student Progress", "AI Detection Summary")
+
+# Services owned by each upload worker process, created once per process
+_worker_doc_service = None
+_worker_analysis_service = None
+
+def _init_upload_worker():
+    """Create the document and analysis services in a worker process."""
+    from ..document.service import DocumentProcessingService
+    from ..analysis.service import AnalysisService
+
+    global _worker_doc_service, _worker_analysis_service
+    _worker_doc_service = DocumentProcessingService()
+    _worker_analysis_service = AnalysisService()
+
+def _analyze_one_file(path: str) -> Dict:
+    """Extract, analyze and store one uploaded file in a worker process."""
+    text = _worker_doc_service._extract_text(Path(path))
+    analysis = _worker_analysis_service.analyze_text(text)
+
+    # Keyed by content, so uploading the same essay again replaces its entry
+    essay_id = "upload_" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    if not _worker_doc_service.db.store_analysis(essay_id, analysis):
+        raise RuntimeError("analysis could not be saved")
+    return {"path": path, "essay_id": essay_id}
 
 class EasyTeacherInterface:
+    # How often the asyncio loop is pumped from the Tk mainloop while
+    # tasks are running; it is not pumped at all while idle
+    PUMP_MS = 10
+    # Upload rows are added to the file view this many at a time
+    FILE_PAGE_SIZE = 100
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("plAIgiarized - Teacher Assistant")
         self.root.geometry("1000x700")
         
-        # Initialize services
-        self.doc_service = DocumentProcessingService()
-        self.analysis_service = AnalysisService()
+        # OCR and analysis are CPU-bound, so uploads run in worker processes;
+        # workers receive only file paths and build their own services
+        self._pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_upload_worker
+        )
+
+        # Background work runs as coroutines on this loop, which is pumped
+        # from the Tk mainloop so everything stays on the main thread
+        self.loop = asyncio.new_event_loop()
+        self._pump_job = None
+
+        # Secondary windows are built on first use and then only hidden
+        self._upload_win = None
+        self._scan_win = None
+        self._reports_win = None
+
+        # Selected upload paths; the file view only holds rows scrolled to
+        self._all_files: List[str] = []
+        self._file_set = set()
+        self._rendered_files = 0
+        # Saved analysis id per processed upload path
+        self._upload_results: Dict[str, str] = {}
         
         # Create main interface
         self._create_interface()
 
+    # Services pull in the OCR and ML stacks, so they are imported and
+    # built on first use rather than before the window appears
+    @cached_property
+    def doc_service(self):
+        from ..document.service import DocumentProcessingService
+        return DocumentProcessingService()
+
+    @cached_property
+    def analysis_service(self):
+        from ..analysis.service import AnalysisService
+        return AnalysisService()
+
     def _create_interface(self):
         """Create simple, intuitive interface."""
         # Main container with padding
@@ -100,8 +164,27 @@ class EasyTeacherInterface:
         )
         status_bar.pack(fill=tk.X)
 
+    def _show_window(self, window, build):
+        """Show a cached secondary window, building it on first use."""
+        if window is None or not window.winfo_exists():
+            window = build()
+            # Closing only hides the window so it can be reused
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            return window, True
+        window.deiconify()
+        window.lift()
+        return window, False
+
     def _upload_essays(self):
         """Handle essay uploads with simple workflow."""
+        self._upload_win, created = self._show_window(
+            self._upload_win, self._build_upload_window
+        )
+        if not created:
+            self._clear_files()
+
+    def _build_upload_window(self) -> tk.Toplevel:
+        """Build the upload window."""
         upload_window = tk.Toplevel(self.root)
         upload_window.title("Upload Essays")
         upload_window.geometry("600x400")
@@ -120,9 +203,23 @@ class EasyTeacherInterface:
         drop_frame = ttk.LabelFrame(frame, padding="30")
         drop_frame.pack(fill=tk.BOTH, expand=True)
 
-        # File list
-        self.file_list = tk.Listbox(drop_frame)
-        self.file_list.pack(fill=tk.BOTH, expand=True)
+        # File list, filled a page at a time as it is scrolled
+        self.file_tree = ttk.Treeview(
+            drop_frame,
+            columns=("name", "size", "status"),
+            show="headings",
+            height=20
+        )
+        for column, width in (("name", 300), ("size", 80), ("status", 80)):
+            self.file_tree.heading(column, text=column.title())
+            self.file_tree.column(column, width=width)
+
+        self._file_scroll = ttk.Scrollbar(
+            drop_frame, orient=tk.VERTICAL, command=self.file_tree.yview
+        )
+        self.file_tree.configure(yscrollcommand=self._on_file_scroll)
+        self._file_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.file_tree.pack(fill=tk.BOTH, expand=True)
 
         # Buttons
         btn_frame = ttk.Frame(frame)
@@ -140,8 +237,56 @@ class EasyTeacherInterface:
             command=lambda: self._process_uploads(upload_window)
         ).pack(side=tk.RIGHT, padx=5)
 
+        return upload_window
+
+    def _select_files(self):
+        """Add selected essay files to the upload list."""
+        paths = filedialog.askopenfilenames(
+            parent=self._upload_win,
+            title="Select Essays",
+            filetypes=[
+                ("Essays", "*.pdf *.docx *.doc *.txt *.jpg *.jpeg *.png"),
+                ("All files", "*.*")
+            ]
+        )
+        new_paths = [path for path in paths if path not in self._file_set]
+        self._all_files.extend(new_paths)
+        self._file_set.update(new_paths)
+
+        # Only fill the first page; the rest is added while scrolling
+        if self._rendered_files < self.FILE_PAGE_SIZE:
+            self._render_more_files()
+
+    def _render_more_files(self):
+        """Add the next page of selected files to the file view."""
+        start = self._rendered_files
+        for path in self._all_files[start:start + self.FILE_PAGE_SIZE]:
+            try:
+                size = f"{os.path.getsize(path) // 1024} KB"
+            except OSError:
+                size = "?"
+            self.file_tree.insert("", tk.END, iid=path, values=(Path(path).name, size, "Queued"))
+        self._rendered_files = min(len(self._all_files), start + self.FILE_PAGE_SIZE)
+
+    def _on_file_scroll(self, first, last):
+        """Update the scrollbar and add rows when the end comes into view."""
+        self._file_scroll.set(first, last)
+        if float(last) >= 1.0 and self._rendered_files < len(self._all_files):
+            self._render_more_files()
+
+    def _clear_files(self):
+        """Forget all selected files."""
+        self.file_tree.delete(*self.file_tree.get_children())
+        self._all_files = []
+        self._file_set = set()
+        self._rendered_files = 0
+
     def _scan_handwritten(self):
         """Handle scanning handwritten work."""
+        self._scan_win, _ = self._show_window(self._scan_win, self._build_scan_window)
+
+    def _build_scan_window(self) -> tk.Toplevel:
+        """Build the handwritten scan window."""
         scan_window = tk.Toplevel(self.root)
         scan_window.title("Scan Handwritten Work")
         scan_window.geometry("600x400")
@@ -176,8 +321,16 @@ class EasyTeacherInterface:
         preview_frame = ttk.LabelFrame(frame, text="Preview", padding="10")
         preview_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
+        return scan_window
+
     def _view_reports(self):
         """Show simplified reports interface."""
+        self._reports_win, _ = self._show_window(
+            self._reports_win, self._build_reports_window
+        )
+
+    def _build_reports_window(self) -> tk.Toplevel:
+        """Build the reports window."""
         reports_window = tk.Toplevel(self.root)
         reports_window.title("View Reports")
         reports_window.geometry("800x600")
@@ -194,22 +347,26 @@ class EasyTeacherInterface:
             text="Select Report Type:"
         ).pack(side=tk.LEFT, padx=(0, 10))
 
-        report_types = ["Class Overview", "Student Progress", "AI Detection Summary"]
-        report_var = tk.StringVar(value=report_types[0])
+        # Kept on the instance so the variable outlives this method
+        self.report_var = tk.StringVar(value=REPORT_TYPES[0])
+        self.report_var.trace_add(
+            "write", lambda *_: self._load_report(self.report_var.get())
+        )
         
-        for report in report_types:
+        for report in REPORT_TYPES:
             ttk.Radiobutton(
                 type_frame,
                 text=report,
-                variable=report_var,
-                value=report,
-                command=lambda: self._load_report(report_var.get())
+                variable=self.report_var,
+                value=report
             ).pack(side=tk.LEFT, padx=10)
 
         # Report content area
         self.report_frame = ttk.Frame(frame)
         self.report_frame.pack(fill=tk.BOTH, expand=True)
 
+        return reports_window
+
     def _process_uploads(self, window):
         """Process uploaded files with progress feedback."""
         try:
@@ -219,17 +376,72 @@ class EasyTeacherInterface:
             progress.start()
 
             # Process files in background
-            threading.Thread(
-                target=self._process_files_background,
-                args=(progress, window)
-            ).start()
+            paths = list(self._all_files)
+            self.loop.create_task(self._process_async(paths, progress, window))
+            self._start_pump()
 
         except Exception as e:
             messagebox.showerror("Error", f"Upload failed: {str(e)}")
 
+    async def _process_async(self, paths: List[str], progress: ttk.Progressbar, window):
+        """Analyze uploads in worker processes and report results."""
+        async def process(path: str) -> bool:
+            name = Path(path).name
+            try:
+                # Workers save each analysis themselves, so only the saved
+                # id comes back instead of the full results
+                result = await self.loop.run_in_executor(self._pool, _analyze_one_file, path)
+                self._upload_results[path] = result["essay_id"]
+                self._set_file_status(path, "Done")
+                self._show_success(f"Processed {name}")
+                return True
+            except Exception as e:
+                self._set_file_status(path, "Failed")
+                self._show_error(f"Could not process {name}: {e}")
+                return False
+
+        results = await asyncio.gather(*(process(path) for path in paths))
+
+        progress.stop()
+        progress.destroy()
+        window.withdraw()
+        self._show_success(f"Processed {sum(results)} of {len(paths)} files")
+
+    def _set_file_status(self, path: str, status: str):
+        """Show a file's processing status if its row has been rendered."""
+        if self.file_tree.exists(path):
+            self.file_tree.set(path, "status", status)
+
+    def _start_pump(self):
+        """Pump the asyncio loop from Tk unless it is already being pumped."""
+        if self._pump_job is None:
+            self._pump_job = self.root.after(0, self._pump)
+
+    def _pump(self):
+        """Run ready asyncio callbacks, rescheduling while tasks remain."""
+        self._pump_job = None
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+        # Once every task has finished the pump stops until the next one
+        # is created, so an idle window never wakes up for it
+        if asyncio.all_tasks(self.loop):
+            self._pump_job = self.root.after(self.PUMP_MS, self._pump)
+
     def run(self):
         """Start the interface."""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self.loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            self.loop.close()
+            self._pool.shutdown(wait=False, cancel_futures=True)
 
     def _show_success(self, message: str):
         """Show success message."""
@@ -1,19 +1,85 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from typing import Dict, List, Optional
+import re
 import threading
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from ..logging.service import LoggingService
-from ..analysis.service import AnalysisService
-from ..student.service import StudentProgressService
-from ..class.service import ClassProgressService
+from ..notification.alert_bus import alert_bus
+from .service_bundle import ServiceBundle
+
+# Help topics keyed by regex group name, in the order they take priority
+_HELP_RE = re.compile(
+    r"(?P<upload>upload|submit)|(?P<ai>\bai\b|detect)|"
+    r"(?P<report>report|progress)|(?P<baseline>baseline)",
+    re.IGNORECASE
+)
+
+_HELP_RESPONSES = {
+    "upload": ("To upload essays:\n"
+               "1. Click '📝 Grade Essays'\n"
+               "2. Select files or drag them in\n"
+               "3. The system will automatically process them\n"
+               "Need more details about a specific step?"),
+    "ai": ("AI detection works by:\n"
+           "1. Analyzing writing patterns\n"
+           "2. Comparing to student baselines\n"
+           "3. Using multiple detection methods\n"
+           "Would you like me to check some essays now?"),
+    "report": ("I can generate several reports:\n"
+               "1. Individual student progress\n"
+               "2. Class-wide trends\n"
+               "3. Writing improvement metrics\n"
+               "Which would you like to see?"),
+    "baseline": ("To add to a student's baseline:\n"
+                 "1. Select verified student work\n"
+                 "2. Click 'Add to Baseline'\n"
+                 "3. The system will update their profile\n"
+                 "Should I help you add some work now?")
+}
+
+_DEFAULT_HELP_RESPONSE = ("I can help with:\n"
+                          "• Uploading and processing essays\n"
+                          "• Checking for AI usage\n"
+                          "• Generating reports\n"
+                          "• Managing student baselines\n"
+                          "What would you like to know more about?")
+
+@lru_cache(maxsize=256)
+def _help_response_cached(key: str) -> str:
+    """Pick the help response for a normalized question."""
+    # One regex pass finds every topic mentioned; the first topic in
+    # priority order wins
+    topics = {match.lastgroup for match in _HELP_RE.finditer(key)}
+    for topic in _HELP_RESPONSES:
+        if topic in topics:
+            return _HELP_RESPONSES[topic]
+    return _DEFAULT_HELP_RESPONSE
 
 class EnhancedSmartAssistant:
-    def __init__(self, parent=None):
+    # Quick action buttons: (label, method name)
+    QUICK_ACTIONS = (
+        ("📝 Grade Essays", "_assist_grading"),
+        ("🔍 Check for AI Usage", "_check_ai"),
+        ("📊 Generate Progress Report", "_generate_report"),
+        ("📈 Show Class Trends", "_show_trends"),
+        ("⚠️ View Important Alerts", "_show_alerts"),
+        ("❓ Get Help", "_show_help")
+    )
+    # Shortest delay between background alert checks; the delay doubles
+    # while nothing new turns up, up to settings["check_interval"]
+    MONITOR_MIN_MS = 1000
+    # Oldest help conversation lines are dropped beyond this
+    MAX_HELP_LINES = 500
+    # Most recent alerts kept from published analysis events
+    MAX_ALERTS = 50
+
+    def __init__(self, parent=None, services: Optional[ServiceBundle] = None):
         self.logger = LoggingService()
-        self.analysis = AnalysisService()
-        self.student_service = StudentProgressService()
-        self.class_service = ClassProgressService()
+        # Services may be shared with other assistants; built on first use
+        self.services = services or ServiceBundle()
         
         # Create assistant window
         self.window = tk.Toplevel(parent) if parent else tk.Tk()
@@ -27,9 +93,30 @@ class EnhancedSmartAssistant:
             "max_suggestions": 5
         }
         
+        self._next_monitor_ms = self.MONITOR_MIN_MS
+        # Alerts already announced, so persisting ones do not ring again
+        self._seen_alerts = set()
+        self._monitor_after_id = None
+        # Alert text by alert id, filled from alert bus events on whatever
+        # thread publishes them
+        self._alerts: OrderedDict = OrderedDict()
+        self._alerts_lock = threading.Lock()
+
         self._create_enhanced_interface()
         self._start_monitoring()
 
+    @property
+    def analysis(self):
+        return self.services.analysis
+
+    @property
+    def student_service(self):
+        return self.services.student_service
+
+    @property
+    def class_service(self):
+        return self.services.class_service
+
     def _create_enhanced_interface(self):
         """Create enhanced smart assistant interface."""
         # Main container with two columns
@@ -44,20 +131,11 @@ class EnhancedSmartAssistant:
         actions = ttk.LabelFrame(left_frame, text="Quick Actions", padding="10")
         actions.pack(fill=tk.X, pady=(0, 10))
 
-        quick_actions = [
-            ("📝 Grade Essays", self._assist_grading),
-            ("🔍 Check for AI Usage", self._check_ai),
-            ("📊 Generate Progress Report", self._generate_report),
-            ("📈 Show Class Trends", self._show_trends),
-            ("⚠️ View Important Alerts", self._show_alerts),
-            ("❓ Get Help", self._show_help)
-        ]
-
-        for text, command in quick_actions:
+        for text, method in self.QUICK_ACTIONS:
             ttk.Button(
                 actions,
                 text=text,
-                command=command,
+                command=getattr(self, method),
                 width=30
             ).pack(pady=2)
 
@@ -147,49 +225,19 @@ class EnhancedSmartAssistant:
 
     def _generate_help_response(self, question: str) -> str:
         """Generate context-aware help response."""
-        # Add intelligence to understand and respond to questions
-        question_lower = question.lower()
-        
-        if "upload" in question_lower or "submit" in question_lower:
-            return ("To upload essays:\n"
-                   "1. Click '📝 Grade Essays'\n"
-                   "2. Select files or drag them in\n"
-                   "3. The system will automatically process them\n"
-                   "Need more details about a specific step?")
-                   
-        elif "ai" in question_lower or "detect" in question_lower:
-            return ("AI detection works by:\n"
-                   "1. Analyzing writing patterns\n"
-                   "2. Comparing to student baselines\n"
-                   "3. Using multiple detection methods\n"
-                   "Would you like me to check some essays now?")
-                   
-        elif "report" in question_lower or "progress" in question_lower:
-            return ("I can generate several reports:\n"
-                   "1. Individual student progress\n"
-                   "2. Class-wide trends\n"
-                   "3. Writing improvement metrics\n"
-                   "Which would you like to see?")
-                   
-        elif "baseline" in question_lower:
-            return ("To add to a student's baseline:\n"
-                   "1. Select verified student work\n"
-                   "2. Click 'Add to Baseline'\n"
-                   "3. The system will update their profile\n"
-                   "Should I help you add some work now?")
-                   
-        else:
-            return ("I can help with:\n"
-                   "• Uploading and processing essays\n"
-                   "• Checking for AI usage\n"
-                   "• Generating reports\n"
-                   "• Managing student baselines\n"
-                   "What would you like to know more about?")
+        # Responses depend only on the words used, so repeated questions
+        # and topic buttons hit the cache
+        return _help_response_cached(" ".join(question.lower().split()))
 
     def _add_to_help_text(self, text: str):
         """Add text to help area."""
         self.help_text.config(state=tk.NORMAL)
         self.help_text.insert(tk.END, text)
+
+        # Keep the widget bounded so inserts and scrolling stay fast
+        lines = int(self.help_text.index("end-1c").split(".")[0])
+        if lines > self.MAX_HELP_LINES:
+            self.help_text.delete("1.0", f"{lines - self.MAX_HELP_LINES + 1}.0")
         self.help_text.see(tk.END)
         self.help_text.config(state=tk.DISABLED)
 
@@ -198,4 +246,89 @@ class EnhancedSmartAssistant:
         response = self._generate_help_response(topic)
         self._add_to_help_text(f"Help for: {topic}\n{response}\n\n")
 
+    def _start_monitoring(self):
+        """Start background monitoring with an adaptive check interval."""
+        self._alert_subscription = alert_bus.subscribe(self._collect_alert)
+        self._next_monitor_ms = self.MONITOR_MIN_MS
+        self._monitor_after_id = self.window.after(self._next_monitor_ms, self._monitor_tick)
+
+    def _monitor_tick(self):
+        """Check for alerts, then schedule the next check.
+
+        New alerts bring the interval back to the minimum; repeated quiet
+        checks back off towards check_interval to avoid idle wakeups.
+        """
+        try:
+            alerts = self._get_important_alerts() or []
+            keys = {alert["id"] if isinstance(alert, dict) else alert for alert in alerts}
+            new_alerts = keys - self._seen_alerts
+            self._seen_alerts = keys
+            if new_alerts:
+                self.window.bell()  # Gentle notification
+                self._show_alerts(alerts)
+                self._next_monitor_ms = self.MONITOR_MIN_MS
+            else:
+                self._next_monitor_ms *= 2
+        except Exception as e:
+            self.logger.error("Error in background monitoring", e)
+            # A failing check backs off like a quiet one
+            self._next_monitor_ms *= 2
+        finally:
+            cap = self.settings["check_interval"] * 1000
+            self._next_monitor_ms = max(self.MONITOR_MIN_MS, min(self._next_monitor_ms, cap))
+            self._monitor_after_id = self.window.after(self._next_monitor_ms, self._monitor_tick)
+
+    def _collect_alert(self, event: Dict):
+        """Record an alert for a published analysis event."""
+        if event.get("type") == "essay_analyzed":
+            score = (event.get("ai_detection") or {}).get("confidence_score", 0.0)
+            if score < self.settings["alert_threshold"]:
+                return
+            key = f"ai:{event['essay_id']}"
+            text = f"⚠️ Essay {event['essay_id']}: possible AI-generated content ({score:.0%})"
+        elif event.get("type") == "progress_analyzed":
+            metrics = [
+                metric for metric, anomaly in (event.get("anomalies") or {}).items()
+                if anomaly.get("severity") == "high"
+            ]
+            if not metrics:
+                return
+            key = f"anomaly:{event['essay_id']}"
+            text = f"⚠️ Student {event['student_id']}: unusual change in {', '.join(metrics)}"
+        else:
+            return
+
+        with self._alerts_lock:
+            self._alerts[key] = text
+            self._alerts.move_to_end(key)
+            while len(self._alerts) > self.MAX_ALERTS:
+                self._alerts.popitem(last=False)
+
+    def _get_important_alerts(self) -> List[Dict]:
+        """Alerts recorded from analysis events, oldest first."""
+        with self._alerts_lock:
+            return [{"id": key, "text": text} for key, text in self._alerts.items()]
+
+    def _show_alerts(self, alerts: Optional[List[Dict]] = None):
+        """Show important alerts, fetching them unless given."""
+        if alerts is None:
+            alerts = self._get_important_alerts()
+        if alerts:
+            text = "\n\n".join(alert["text"] for alert in alerts)
+        else:
+            text = "No important alerts at this time! ✅"
+        self.suggestion_text.config(state=tk.NORMAL)
+        self.suggestion_text.delete(1.0, tk.END)
+        self.suggestion_text.insert(1.0, text)
+        self.suggestion_text.config(state=tk.DISABLED)
+        self.status_var.set("Alerts updated!")
+
+    def destroy(self):
+        """Clean up resources."""
+        alert_bus.unsubscribe(self._alert_subscription)
+        if self._monitor_after_id is not None:
+            self.window.after_cancel(self._monitor_after_id)
+            self._monitor_after_id = None
+        self.window.destroy()
+
     # ... (rest of the original SmartAssistant methods remain the same) 
\ No newline at end of file
@@ -1,12 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import json
-from typing import Dict, List
+import weakref
+from typing import Dict, List, Tuple
 from ..docs.glossary import GlossaryService
 
 class GlossaryInterface:
+    # Quiet period after the last keystroke before a search runs
+    SEARCH_DELAY_MS = 150
+    # Tk roots whose ttk styles have already been configured
+    _styled_roots = weakref.WeakSet()
+
     def __init__(self, root=None):
         self.glossary_service = GlossaryService()
+        self._search_after_id = None
+        self._last_query = None
+        self._shown_results = None
+        self._build_search_index()
         
         # Create main window if not provided
         if root is None:
@@ -20,18 +30,46 @@ class GlossaryInterface:
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-        # Style configuration
-        style = ttk.Style()
-        style.configure("Title.TLabel", font=("Arial", 16, "bold"))
-        style.configure("Category.TLabel", font=("Arial", 12, "bold"))
-        style.configure("Term.TLabel", font=("Arial", 10, "bold"))
-        style.configure("Search.TEntry", font=("Arial", 10))
+        # Style configuration, once per Tk interpreter
+        tk_root = self.root.nametowidget(".")
+        if tk_root not in GlossaryInterface._styled_roots:
+            style = ttk.Style(tk_root)
+            style.configure("Title.TLabel", font=("Arial", 16, "bold"))
+            style.configure("Category.TLabel", font=("Arial", 12, "bold"))
+            style.configure("Term.TLabel", font=("Arial", 10, "bold"))
+            style.configure("Search.TEntry", font=("Arial", 10))
+            GlossaryInterface._styled_roots.add(tk_root)
 
         self._create_search_bar()
         self._create_quick_index()
         self._create_content_area()
         self._populate_initial_content()
 
+    def _build_search_index(self):
+        """Precompute lowercase search text for every glossary term."""
+        # Each row is (category, term, details, searchable text); a query
+        # matches when it occurs in the term name or its definition
+        self._search_rows: List[Tuple[str, str, Dict, str]] = [
+            (category, term, details, f"{term.lower()}\n{details['definition'].lower()}")
+            for category, terms in self.glossary_service.glossary.items()
+            for term, details in terms.items()
+        ]
+        self._hits_query = ""
+        self._hits = self._search_rows
+
+    def _search_terms(self, query: str) -> Dict:
+        """Search the precomputed index; same results as search_terms."""
+        # Extending the query can only narrow the matches, so scan the
+        # previous hits instead of the whole glossary
+        rows = self._hits if query.startswith(self._hits_query) else self._search_rows
+        self._hits = [row for row in rows if query in row[3]]
+        self._hits_query = query
+
+        results: Dict[str, Dict] = {}
+        for category, term, details, _ in self._hits:
+            results.setdefault(category, {})[term] = details
+        return results
+
     def _create_search_bar(self):
         """Create search bar with real-time filtering."""
         search_frame = ttk.Frame(self.main_frame)
@@ -109,13 +147,24 @@ class GlossaryInterface:
         self.content_text.config(state=tk.DISABLED)
 
     def _on_search_change(self, *args):
-        """Handle search input changes."""
+        """Handle search input changes, coalescing bursts of keystrokes."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.SEARCH_DELAY_MS, self._do_search)
+
+    def _do_search(self):
+        """Run the search for the current query."""
+        self._search_after_id = None
         search_text = self.search_var.get().strip().lower()
+        if search_text == self._last_query:
+            return
+
         if search_text:
-            results = self.glossary_service.search_terms(search_text)
+            results = self._search_terms(search_text)
             self._display_search_results(results)
         else:
             self._populate_initial_content()
+        self._last_query = search_text
 
     def _clear_search(self):
         """Clear search and reset display."""
@@ -127,29 +176,40 @@ class GlossaryInterface:
         self.content_title.config(text=category)
         terms = self.glossary_service.get_category(category)
         self._update_content_display(terms)
+        self._last_query = None
+        self._shown_results = None
 
     def _display_search_results(self, results: Dict):
         """Display search results."""
+        # A longer query often matches the same terms; keep the text as is
+        if results == self._shown_results:
+            return
         self.content_title.config(text="Search Results")
         self._update_content_display(results)
+        self._shown_results = results
 
     def _update_content_display(self, content: Dict):
         """Update the content area with formatted text."""
-        self.content_text.config(state=tk.NORMAL)
-        self.content_text.delete(1.0, tk.END)
-
+        # Build (text, tags) pairs and hand them to Tk in one insert call
+        # instead of one round-trip per line
+        chunks = []
         for category, terms in content.items():
             # Add category header
-            self.content_text.insert(tk.END, f"\n{category}\n", "category")
-            self.content_text.insert(tk.END, "="*50 + "\n\n")
+            chunks += [f"\n{category}\n", "category", "="*50 + "\n\n", ""]
 
             # Add terms and definitions
             for term, details in terms.items():
-                self.content_text.insert(tk.END, f"{term}\n", "term")
-                self.content_text.insert(tk.END, f"Definition: {details['definition']}\n")
-                self.content_text.insert(tk.END, f"Example: {details['example']}\n")
-                self.content_text.insert(tk.END, f"How it's used: {details['how_its_used']}\n\n")
+                chunks += [
+                    f"{term}\n", "term",
+                    f"Definition: {details['definition']}\n"
+                    f"Example: {details['example']}\n"
+                    f"How it's used: {details['how_its_used']}\n\n", ""
+                ]
 
+        self.content_text.config(state=tk.NORMAL)
+        self.content_text.delete(1.0, tk.END)
+        if chunks:
+            self.content_text.insert(tk.END, *chunks)
         self.content_text.config(state=tk.DISABLED)
 
     def _populate_initial_content(self):
@@ -171,5 +231,8 @@ class GlossaryInterface:
 
     def destroy(self):
         """Clean up resources."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
         if isinstance(self.root, tk.Tk):
             self.root.destroy() 
\ No newline at end of file
@@ -0,0 +1,53 @@
+import importlib
+import threading
+
+class ServiceBundle:
+    """Analysis services shared by the assistant interfaces.
+
+    Each service is imported and built on first use, so one bundle can be
+    handed to several assistants without loading models they never touch.
+    Worker threads may ask for the same service at once; it is still
+    built only once.
+    """
+
+    def __init__(self):
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory):
+        """Return a built service, building it under the lock if needed."""
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._services[name] = factory()
+        return service
+
+    @property
+    def analysis(self):
+        return self._get("analysis", self._build_analysis)
+
+    @property
+    def student_service(self):
+        return self._get("student_service", self._build_student_service)
+
+    @property
+    def class_service(self):
+        return self._get("class_service", self._build_class_service)
+
+    @staticmethod
+    def _build_analysis():
+        from ..analysis.service import AnalysisService
+        return AnalysisService()
+
+    @staticmethod
+    def _build_student_service():
+        from ..student.service import StudentProgressService
+        return StudentProgressService()
+
+    @staticmethod
+    def _build_class_service():
+        # "class" is a keyword, so the package can only be loaded by name
+        module = importlib.import_module("..class.service", __package__)
+        return module.ClassProgressService()
@@ -1,19 +1,45 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, List, Optional
+import hashlib
+import re
 import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 from datetime import datetime, timedelta
 from ..logging.service import LoggingService
-from ..analysis.service import AnalysisService
-from ..student.service import StudentProgressService
-from ..class.service import ClassProgressService
+from ..notification.alert_bus import alert_bus
+from .service_bundle import ServiceBundle
+from .ui_queue import UIQueuePump
 
 class SmartAssistant:
-    def __init__(self, parent=None):
+    # Quick action buttons: (label, method name)
+    QUICK_ACTIONS = (
+        ("📝 Grade Essays", "_assist_grading"),
+        ("🔍 Check for AI Usage", "_check_ai"),
+        ("📊 Generate Progress Report", "_generate_report"),
+        ("📈 Show Class Trends", "_show_trends"),
+        ("⚠️ View Important Alerts", "_show_alerts")
+    )
+    # How often queued worker-thread UI updates are applied
+    UI_DRAIN_MS = 30
+    # Background actions share a small pool so repeated clicks cannot
+    # pile up threads competing with the analysis models
+    WORKER_THREADS = 2
+    # Text analyses kept in memory, keyed by content hash
+    ANALYSIS_CACHE_SIZE = 512
+    # Near-duplicate cache for AI checks: hashed word-bigram vectors of
+    # checked essays, stored as int8 with a per-vector scale, and their AI
+    # probabilities
+    SHINGLE_DIM = 1024
+    SIMILARITY_THRESHOLD = 0.86
+    AI_CENTROID_LIMIT = 1024
+
+    def __init__(self, parent=None, services: Optional[ServiceBundle] = None):
         self.logger = LoggingService()
-        self.analysis = AnalysisService()
-        self.student_service = StudentProgressService()
-        self.class_service = ClassProgressService()
+        # Services may be shared with other assistants; built on first use
+        self.services = services or ServiceBundle()
         
         # Create assistant window
         self.window = tk.Toplevel(parent) if parent else tk.Tk()
@@ -24,11 +50,53 @@ class SmartAssistant:
         self.settings = {
             "alert_threshold": 0.85,  # High confidence for alerts
             "check_interval": 300,  # 5 minutes
+            "max_check_interval": 3600,  # Back-off limit when idle
             "max_suggestions": 5
         }
         
+        # Worker threads never touch Tk; they queue (callable, args) pairs
+        # that the main thread applies
+        self._ui_pump = UIQueuePump(self.window, self.UI_DRAIN_MS, self.logger)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.WORKER_THREADS, thread_name_prefix="assistant"
+        )
+        self._action_futures: Dict[str, Future] = {}
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_lock = threading.Lock()
+        self._ai_centroids = np.empty((0, self.SHINGLE_DIM), dtype=np.int8)
+        self._ai_centroid_scales = np.empty(0, dtype=np.float32)
+        self._ai_centroid_probs = np.empty(0, dtype=np.float32)
+        self._alert_check_job = None
+        # Alerts already announced, so persisting ones do not ring again
+        self._seen_alerts = set()
+        self._shown_suggestion = None
+        # Bursts of suggestion updates are coalesced into one idle redraw
+        self._pending_suggestion: Optional[str] = None
+        self._suggestion_job = None
+        self._consecutive_empty_polls = 0
+        self.current_interval = self.settings["check_interval"]
+        # Pending after() ids, cancelled in destroy()
+        self._startup_check_job = None
+        self._poll_job = None
+        self._closed = False
+
         self._create_interface()
+        # Closing the window must also stop the after() chains below
+        self.window.protocol("WM_DELETE_WINDOW", self.destroy)
         self._start_monitoring()
+        self._ui_pump.start()
+
+    @property
+    def analysis(self):
+        return self.services.analysis
+
+    @property
+    def student_service(self):
+        return self.services.student_service
+
+    @property
+    def class_service(self):
+        return self.services.class_service
 
     def _create_interface(self):
         """Create smart assistant interface."""
@@ -40,19 +108,11 @@ class SmartAssistant:
         actions = ttk.LabelFrame(main, text="I can help you...", padding="10")
         actions.pack(fill=tk.X, pady=(0, 10))
 
-        quick_actions = [
-            ("📝 Grade Essays", self._assist_grading),
-            ("🔍 Check for AI Usage", self._check_ai),
-            ("📊 Generate Progress Report", self._generate_report),
-            ("📈 Show Class Trends", self._show_trends),
-            ("⚠️ View Important Alerts", self._show_alerts)
-        ]
-
-        for text, command in quick_actions:
+        for text, method in self.QUICK_ACTIONS:
             ttk.Button(
                 actions,
                 text=text,
-                command=command,
+                command=getattr(self, method),
                 width=30
             ).pack(pady=2)
 
@@ -88,24 +148,28 @@ class SmartAssistant:
                 ungraded = self._get_ungraded_essays()
                 
                 if not ungraded:
-                    self._update_suggestions("All essays are graded! 🎉")
+                    self._post(self._update_suggestions, "All essays are graded! 🎉")
                     return
 
-                # Analyze and suggest grades
+                # Analyze and suggest grades; analysis and baseline lookups
+                # are done for the whole batch up front
                 suggestions = []
-                for essay in ungraded:
-                    analysis = self.analysis._analyze_text(essay["content"])
-                    baseline = self.student_service._get_student_baseline(essay["student_id"])
+                analyses = self._analyze_texts_cached([essay["content"] for essay in ungraded])
+                baselines = self.student_service.get_baselines(
+                    [essay["student_id"] for essay in ungraded]
+                )
+                for essay, analysis in zip(ungraded, analyses):
+                    baseline = baselines[essay["student_id"]]
                     
                     suggestion = self._generate_grading_suggestion(
                         essay, analysis, baseline
                     )
                     suggestions.append(suggestion)
 
-                self._update_suggestions("\n\n".join(suggestions))
-                self.status_var.set("Grading suggestions ready!")
+                self._post(self._update_suggestions, "\n\n".join(suggestions))
+                self._post(self.status_var.set, "Grading suggestions ready!")
 
-            threading.Thread(target=process).start()
+            self._run_in_background("grading", process, "Error generating grading suggestions")
 
         except Exception as e:
             self.logger.error("Error in grading assistance", e)
@@ -120,22 +184,22 @@ class SmartAssistant:
                 recent_essays = self._get_recent_essays()
                 alerts = []
 
-                for essay in recent_essays:
-                    analysis = self.analysis._analyze_text(essay["content"])
-                    if analysis["ai_probability"] > self.settings["alert_threshold"]:
+                probabilities = self._ai_probabilities([essay["content"] for essay in recent_essays])
+                for essay, ai_probability in zip(recent_essays, probabilities):
+                    if ai_probability > self.settings["alert_threshold"]:
                         alerts.append(
-                            f"⚠️ High AI probability ({analysis['ai_probability']:.1%}) "
+                            f"⚠️ High AI probability ({ai_probability:.1%}) "
                             f"in {essay['student_name']}'s essay"
                         )
 
                 if alerts:
-                    self._update_suggestions("\n".join(alerts))
+                    self._post(self._update_suggestions, "\n".join(alerts))
                 else:
-                    self._update_suggestions("No suspicious AI usage detected! ✅")
+                    self._post(self._update_suggestions, "No suspicious AI usage detected! ✅")
                 
-                self.status_var.set("AI check complete!")
+                self._post(self.status_var.set, "AI check complete!")
 
-            threading.Thread(target=process).start()
+            self._run_in_background("ai_check", process, "Error checking AI usage")
 
         except Exception as e:
             self.logger.error("Error in AI check", e)
@@ -166,10 +230,10 @@ class SmartAssistant:
                 for action in class_data["recommended_actions"][:3]:
                     insights.append(f"• {action}")
 
-                self._update_suggestions("\n".join(insights))
-                self.status_var.set("Report ready!")
+                self._post(self._update_suggestions, "\n".join(insights))
+                self._post(self.status_var.set, "Report ready!")
 
-            threading.Thread(target=process).start()
+            self._run_in_background("report", process, "Error generating report")
 
         except Exception as e:
             self.logger.error("Error generating report", e)
@@ -197,19 +261,20 @@ class SmartAssistant:
                 for change in trends["notable_changes"]:
                     insights.append(f"• {change}")
 
-                self._update_suggestions("\n".join(insights))
-                self.status_var.set("Trends analysis complete!")
+                self._post(self._update_suggestions, "\n".join(insights))
+                self._post(self.status_var.set, "Trends analysis complete!")
 
-            threading.Thread(target=process).start()
+            self._run_in_background("trends", process, "Error analyzing trends")
 
         except Exception as e:
             self.logger.error("Error showing trends", e)
             self.status_var.set("Error analyzing trends")
 
-    def _show_alerts(self):
-        """Show important alerts."""
+    def _show_alerts(self, alerts: Optional[List] = None):
+        """Show important alerts, fetching them unless given."""
         try:
-            alerts = self._get_important_alerts()
+            if alerts is None:
+                alerts = self._get_important_alerts()
             if alerts:
                 self._update_suggestions("\n\n".join(alerts))
             else:
@@ -221,30 +286,229 @@ class SmartAssistant:
             self.logger.error("Error showing alerts", e)
             self.status_var.set("Error showing alerts")
 
+    def _content_key(self, content: str) -> bytes:
+        """Hash identifying an exact copy of an essay text."""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def _analyze_texts_cached(self, contents: List[str]) -> List[Dict]:
+        """Analyze essay texts, reusing results for identical content.
+
+        Texts not in the cache are analyzed together in one batch.
+        """
+        keys = [self._content_key(content) for content in contents]
+        found = {}
+        missing = {}
+        with self._analysis_lock:
+            for key, content in zip(keys, contents):
+                analysis = self._analysis_cache.get(key)
+                if analysis is not None:
+                    self._analysis_cache.move_to_end(key)
+                    found[key] = analysis
+                else:
+                    missing[key] = content
+
+        if missing:
+            analyses = self.analysis.analyze_texts(list(missing.values()))
+            with self._analysis_lock:
+                for key, analysis in zip(missing, analyses):
+                    found[key] = analysis
+                    self._analysis_cache[key] = analysis
+                while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+
+        return [found[key] for key in keys]
+
+    def _shingle_vectors(self, contents: List[str]) -> np.ndarray:
+        """Embed texts as L2-normalized hashed word-bigram count vectors."""
+        vectors = np.zeros((len(contents), self.SHINGLE_DIM), dtype=np.float32)
+        for row, content in enumerate(contents):
+            words = re.findall(r"\w+", content.lower())
+            buckets = [hash(pair) % self.SHINGLE_DIM for pair in zip(words, words[1:])]
+            if buckets:
+                vectors[row] = np.bincount(buckets, minlength=self.SHINGLE_DIM)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _quantize(self, vectors: np.ndarray):
+        """Quantize rows to int8 with a per-row scale (row ~= q * scale)."""
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def _ai_probabilities(self, contents: List[str]) -> List[float]:
+        """AI probability per text; exact copies are checked only once."""
+        groups: Dict[bytes, List[int]] = {}
+        for i, content in enumerate(contents):
+            groups.setdefault(self._content_key(content), []).append(i)
+
+        unique = [contents[rows[0]] for rows in groups.values()]
+        probabilities = [0.0] * len(contents)
+        for rows, probability in zip(groups.values(), self._unique_ai_probabilities(unique)):
+            for i in rows:
+                probabilities[i] = probability
+        return probabilities
+
+    def _unique_ai_probabilities(self, contents: List[str]) -> List[float]:
+        """AI probability per distinct text, reusing results for near-duplicates.
+
+        A text whose bigram vector is within SIMILARITY_THRESHOLD cosine
+        of an already checked text reuses that text's probability; the
+        rest go through the full analysis.
+        """
+        vectors = self._shingle_vectors(contents)
+        probabilities = np.zeros(len(contents), dtype=np.float32)
+        misses = np.ones(len(contents), dtype=bool)
+
+        with self._analysis_lock:
+            centroids = self._ai_centroids
+            centroid_scales = self._ai_centroid_scales
+            centroid_probs = self._ai_centroid_probs
+        if len(centroids):
+            # Query vectors stay float32; only the stored side is quantized
+            similarity = (vectors @ centroids.T.astype(np.float32)) * centroid_scales
+            best = similarity.argmax(axis=1)
+            hits = similarity[np.arange(len(contents)), best] >= self.SIMILARITY_THRESHOLD
+            probabilities[hits] = centroid_probs[best[hits]]
+            misses = ~hits
+
+        miss_rows = np.flatnonzero(misses)
+        if len(miss_rows):
+            analyses = self._analyze_texts_cached([contents[i] for i in miss_rows])
+            for i, analysis in zip(miss_rows, analyses):
+                probabilities[i] = analysis.get("ai_detection", {}).get("confidence_score", 0.0)
+
+            with self._analysis_lock:
+                quantized, scales = self._quantize(vectors[miss_rows])
+                self._ai_centroids = np.vstack([self._ai_centroids, quantized])[-self.AI_CENTROID_LIMIT:]
+                self._ai_centroid_scales = np.concatenate(
+                    [self._ai_centroid_scales, scales]
+                )[-self.AI_CENTROID_LIMIT:]
+                self._ai_centroid_probs = np.concatenate(
+                    [self._ai_centroid_probs, probabilities[miss_rows]]
+                )[-self.AI_CENTROID_LIMIT:]
+
+        return probabilities.tolist()
+
+    def _run_in_background(self, action: str, work, error_status: str):
+        """Run work on the worker pool, reporting failures via the queue.
+
+        A queued run of the same action that has not started yet is
+        cancelled, so rapid clicks only do the latest request.
+        """
+        previous = self._action_futures.get(action)
+        if previous is not None:
+            previous.cancel()
+
+        def run():
+            try:
+                work()
+            except Exception as e:
+                self.logger.error(error_status, e)
+                self._post(self.status_var.set, error_status)
+
+        self._action_futures[action] = self._pool.submit(run)
+
+    def _post(self, func, *args):
+        """Queue a UI update from a worker thread for the main thread."""
+        self._ui_pump.post(func, *args)
+
     def _update_suggestions(self, text: str):
-        """Update suggestions text safely."""
+        """Schedule a suggestions update; only the latest text is drawn."""
+        self._pending_suggestion = text
+        if self._suggestion_job is None:
+            self._suggestion_job = self.window.after_idle(self._flush_suggestion)
+
+    def _flush_suggestion(self):
+        """Write the latest pending suggestions text."""
+        self._suggestion_job = None
+        text, self._pending_suggestion = self._pending_suggestion, None
+        # Periodic refreshes often repeat the same text; skip the redraw
+        if text is None or text == self._shown_suggestion:
+            return
+        self._shown_suggestion = text
         self.suggestion_text.config(state=tk.NORMAL)
         self.suggestion_text.delete(1.0, tk.END)
         self.suggestion_text.insert(1.0, text)
         self.suggestion_text.config(state=tk.DISABLED)
 
     def _start_monitoring(self):
-        """Start background monitoring."""
-        def check_for_updates():
-            try:
-                alerts = self._get_important_alerts()
-                if alerts:
-                    self.window.bell()  # Gentle notification
-                    self._show_alerts()
-            except Exception as e:
-                self.logger.error("Error in background monitoring", e)
-            finally:
-                self.window.after(
-                    self.settings["check_interval"] * 1000,
-                    check_for_updates
-                )
+        """Start background monitoring.
+
+        Alerts are checked when services publish new analysis results,
+        plus once at startup. A backing-off poll catches results that are
+        published in other processes.
+        """
+        # Publishers may run on worker threads; hand events to the Tk thread
+        self._alert_subscription = alert_bus.subscribe(
+            lambda event: self._post(self._on_alert_event, event)
+        )
+        self._startup_check_job = self.window.after(1000, self._startup_check)
+        self._schedule_poll()
+
+    def _startup_check(self):
+        """Initial alert check shortly after the window opens."""
+        self._startup_check_job = None
+        self._check_for_updates()
+
+    def _schedule_poll(self):
+        """Schedule the next fallback poll with exponential back-off."""
+        base = self.settings["check_interval"]
+        self.current_interval = min(
+            self.settings["max_check_interval"],
+            base * 2 ** self._consecutive_empty_polls
+        )
+        self._poll_job = self.window.after(
+            self.current_interval * 1000, self._poll_alerts
+        )
+
+    def _poll_alerts(self):
+        """Fallback alert poll; skipped while the window is hidden."""
+        self._poll_job = None
+        if self._closed:
+            return
+        if self.window.state() not in ("iconic", "withdrawn"):
+            if self._check_for_updates():
+                self._consecutive_empty_polls = 0
+            elif self.current_interval < self.settings["max_check_interval"]:
+                self._consecutive_empty_polls += 1
+        self._schedule_poll()
+
+    def _on_alert_event(self, event: Dict):
+        """Schedule one alert check for a burst of published events."""
+        if self._alert_check_job is None:
+            self._alert_check_job = self.window.after_idle(self._run_alert_check)
+
+    def _run_alert_check(self):
+        """Idle alert check scheduled by _on_alert_event."""
+        self._alert_check_job = None
+        self._check_for_updates()
+
+    def _check_for_updates(self) -> bool:
+        """Check for important alerts and notify the teacher.
+
+        Returns True when there were new alerts to show.
+        """
+        try:
+            alerts = self._get_important_alerts() or []
+            keys = {self._alert_key(alert) for alert in alerts}
+            new_alerts = keys - self._seen_alerts
+            # Only alerts still active are remembered; one that clears and
+            # comes back is announced again
+            self._seen_alerts = keys
+            if new_alerts:
+                self.window.bell()  # Gentle notification
+                self._show_alerts(alerts)
+                # Activity: poll at the base rate again
+                self._consecutive_empty_polls = 0
+                return True
+        except Exception as e:
+            self.logger.error("Error in background monitoring", e)
+        return False
 
-        self.window.after(1000, check_for_updates)
+    def _alert_key(self, alert) -> str:
+        """Identity of an alert: its id, or the alert text itself."""
+        return alert["id"] if isinstance(alert, dict) else alert
 
     def run(self):
         """Start the assistant."""
@@ -252,4 +516,15 @@ class SmartAssistant:
 
     def destroy(self):
         """Clean up resources."""
+        self._closed = True
+        alert_bus.unsubscribe(self._alert_subscription)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._ui_pump.stop()
+        for job in (self._suggestion_job, self._startup_check_job,
+                    self._poll_job, self._alert_check_job):
+            if job is not None:
+                self.window.after_cancel(job)
+        self._suggestion_job = None
+        self._startup_check_job = self._poll_job = None
+        self._alert_check_job = None
         self.window.destroy() 
\ No newline at end of file
@@ -2,18 +2,24 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 from typing import Dict, List, Optional
 import json
+import queue
+import re
+import threading
 from datetime import datetime
 from ..logging.service import LoggingService
-from ..analysis.service import AnalysisService
-from ..student.service import StudentProgressService
-from ..class.service import ClassProgressService
+from .service_bundle import ServiceBundle
+from .ui_queue import UIQueuePump
 
 class TeacherAssistantBot:
-    def __init__(self, parent=None):
+    # How often replies from the response thread are applied
+    UI_DRAIN_MS = 30
+    # Oldest chat lines are trimmed beyond this many
+    MAX_CHAT_LINES = 1000
+
+    def __init__(self, parent=None, services: Optional[ServiceBundle] = None):
         self.logger = LoggingService()
-        self.analysis = AnalysisService()
-        self.student_service = StudentProgressService()
-        self.class_service = ClassProgressService()
+        # Services may be shared with other assistants; built on first use
+        self.services = services or ServiceBundle()
         
         # Create bot window
         self.window = tk.Toplevel(parent) if parent else tk.Tk()
@@ -43,8 +49,62 @@ class TeacherAssistantBot:
                 "response": "I can help with:\n1. Essay uploads and processing\n2. AI detection\n3. Progress tracking\n4. Report generation\n5. Writing analysis\nWhat would you like to know more about?"
             }
         }
+
+        # Queries handled outside the knowledge base, checked after it
+        self.query_handlers = {
+            "grade": self._handle_grading_query,
+            "compare": self._handle_comparison_query,
+            "improve": self._handle_improvement_query,
+            "explain": self._handle_explanation_query
+        }
+        self._compile_keywords()
+
+        # Replies are generated on one worker thread, in the order questions
+        # were asked; the worker never touches Tk and queues UI updates
+        self._request_q = queue.Queue()
+        self._ui_pump = UIQueuePump(self.window, self.UI_DRAIN_MS, self.logger)
+        # Chat messages are appended in one batch when Tk goes idle
+        self._pending_chat: List = []
+        self._chat_job = None
+        threading.Thread(target=self._respond_worker, daemon=True).start()
         
         self._create_interface()
+        # Closing the window must also stop the UI queue pump
+        self.window.protocol("WM_DELETE_WINDOW", self.destroy)
+        self._ui_pump.start()
+
+    @property
+    def analysis(self):
+        return self.services.analysis
+
+    @property
+    def student_service(self):
+        return self.services.student_service
+
+    @property
+    def class_service(self):
+        return self.services.class_service
+
+    def _compile_keywords(self):
+        """Build the keyword dispatch table and one regex over its keywords."""
+        # Each keyword maps to (priority, responder); knowledge base topics
+        # win over query handlers, in definition order
+        responders = [
+            (data["keywords"], lambda query, response=data["response"]: response)
+            for data in self.knowledge_base.values()
+        ] + [([topic], handler) for topic, handler in self.query_handlers.items()]
+        self._kw_dispatch = {}
+        for priority, (keywords, responder) in enumerate(responders):
+            for keyword in keywords:
+                self._kw_dispatch.setdefault(keyword.lower(), (priority, responder))
+
+        # Longest keywords first so the alternation prefers them; keywords
+        # match at the start of a word ("uploading", but not "explain" for "ai")
+        keywords = sorted(self._kw_dispatch, key=len, reverse=True)
+        self._kw_regex = re.compile(
+            r"\b(" + "|".join(re.escape(keyword) for keyword in keywords) + r")",
+            re.IGNORECASE
+        )
 
     def _create_interface(self):
         """Create chat interface."""
@@ -60,7 +120,11 @@ class TeacherAssistantBot:
             font=("Arial", 10)
         )
         self.chat_history.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        self.chat_history.config(state=tk.DISABLED)
+        # Read-only for the user without toggling the widget state on every
+        # message; copy and select-all still work
+        self.chat_history.bind("<Key>", self._block_chat_edit)
+        for sequence in ("<<Paste>>", "<<Cut>>", "<<Clear>>", "<<PasteSelection>>"):
+            self.chat_history.bind(sequence, lambda e: "break")
 
         # Quick questions
         questions_frame = ttk.LabelFrame(main, text="Quick Questions", padding="5")
@@ -119,27 +183,31 @@ class TeacherAssistantBot:
         self._add_user_message(user_input)
         self.input_field.delete(0, tk.END)
 
-        # Generate and add response
-        response = self._generate_response(user_input)
-        self._add_bot_message(response)
+        # Generate the response off the Tk thread
+        self._request_q.put(user_input)
+
+    def _respond_worker(self):
+        """Answer queued questions in order on a background thread."""
+        while True:
+            user_input = self._request_q.get()
+            if user_input is None:
+                break
+            response = self._generate_response(user_input)
+            self._ui_pump.post(self._add_bot_message, response)
 
     def _generate_response(self, user_input: str) -> str:
         """Generate contextual response."""
         try:
-            # Check knowledge base first
-            for topic, data in self.knowledge_base.items():
-                if any(keyword in user_input.lower() for keyword in data["keywords"]):
-                    return data["response"]
-
-            # Handle specific queries
-            if "grade" in user_input.lower():
-                return self._handle_grading_query(user_input)
-            elif "compare" in user_input.lower():
-                return self._handle_comparison_query(user_input)
-            elif "improve" in user_input.lower():
-                return self._handle_improvement_query(user_input)
-            elif "explain" in user_input.lower():
-                return self._handle_explanation_query(user_input)
+            # One scan finds every mentioned keyword; the highest priority
+            # responder answers
+            entry = min(
+                (self._kw_dispatch[match.group(1).lower()]
+                 for match in self._kw_regex.finditer(user_input)),
+                key=lambda entry: entry[0],
+                default=None
+            )
+            if entry:
+                return entry[1](user_input)
             
             # Default response with suggestion
             return (
@@ -199,27 +267,44 @@ class TeacherAssistantBot:
             "What would you like me to explain?"
         )
 
+    def _block_chat_edit(self, event):
+        """Swallow keys that would edit the chat history."""
+        if event.state & 0x4 and event.keysym.lower() in ("c", "a"):
+            return None
+        if event.keysym in ("Up", "Down", "Left", "Right", "Prior", "Next", "Home", "End"):
+            return None
+        return "break"
+
+    def _append_chat(self, speaker: str, tag: str, message: str):
+        """Queue a message for the next idle chat update."""
+        self._pending_chat.extend((f"\n{speaker}: ", tag, f"{message}\n", ()))
+        if self._chat_job is None:
+            self._chat_job = self.window.after_idle(self._flush_chat)
+
+    def _flush_chat(self):
+        """Append pending messages and trim the oldest lines past the cap."""
+        self._chat_job = None
+        chunks, self._pending_chat = self._pending_chat, []
+        if not chunks:
+            return
+        self.chat_history.insert(tk.END, *chunks)
+        lines = int(self.chat_history.index("end-1c").split(".")[0])
+        if lines > self.MAX_CHAT_LINES:
+            self.chat_history.delete("1.0", f"{lines - self.MAX_CHAT_LINES + 1}.0")
+        self.chat_history.see(tk.END)
+
     def _add_user_message(self, message: str):
         """Add user message to chat history."""
-        self.chat_history.config(state=tk.NORMAL)
-        self.chat_history.insert(tk.END, "\nYou: ", "user")
-        self.chat_history.insert(tk.END, f"{message}\n")
-        self.chat_history.see(tk.END)
-        self.chat_history.config(state=tk.DISABLED)
+        self._append_chat("You", "user", message)
 
     def _add_bot_message(self, message: str):
         """Add bot message to chat history."""
-        self.chat_history.config(state=tk.NORMAL)
-        self.chat_history.insert(tk.END, "\nAssistant: ", "bot")
-        self.chat_history.insert(tk.END, f"{message}\n")
-        self.chat_history.see(tk.END)
-        self.chat_history.config(state=tk.DISABLED)
+        self._append_chat("Assistant", "bot", message)
 
     def _handle_quick_question(self, question: str):
         """Handle quick question button clicks."""
         self._add_user_message(question)
-        response = self._generate_response(question)
-        self._add_bot_message(response)
+        self._request_q.put(question)
 
     def run(self):
         """Start the bot interface."""
@@ -227,4 +312,8 @@ class TeacherAssistantBot:
 
     def destroy(self):
         """Clean up resources."""
+        self._request_q.put(None)
+        self._ui_pump.stop()
+        if self._chat_job is not None:
+            self.window.after_cancel(self._chat_job)
         self.window.destroy() 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import queue
+from ..logging.service import LoggingService
+
+class UIQueuePump:
+    """UI updates queued by worker threads, applied on the Tk main thread.
+
+    Workers never touch Tk; they post (callable, args) pairs and the pump
+    drains them from an after() loop until stop() cancels it.
+    """
+
+    def __init__(self, widget, interval_ms: int, logger: LoggingService = None):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.logger = logger or LoggingService()
+        self._q = queue.Queue()
+        self._job = None
+        self._running = False
+
+    def post(self, func, *args):
+        """Queue a UI update; safe to call from any thread."""
+        self._q.put((func, args))
+
+    def start(self):
+        """Begin draining the queue on the Tk event loop."""
+        if not self._running:
+            self._running = True
+            self._job = self.widget.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Cancel the drain loop; queued updates are dropped."""
+        self._running = False
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _drain(self):
+        """Apply queued UI updates, then schedule the next drain."""
+        self._job = None
+        if not self._running:
+            return
+        while True:
+            try:
+                func, args = self._q.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.error("Error applying UI update", e)
+        # An update may have closed the window and stopped the pump
+        if self._running:
+            self._job = self.widget.after(self.interval_ms, self._drain)
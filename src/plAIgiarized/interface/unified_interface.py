@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 from typing import Dict, List, Optional
 from .enhanced_assistant import EnhancedSmartAssistant
 from .teacher_assistant_bot import TeacherAssistantBot
+from .service_bundle import ServiceBundle
 from ..logging.service import LoggingService
 
 class UnifiedInterface:
@@ -14,6 +15,9 @@ class UnifiedInterface:
         self.root.title("plAIgiarized Teaching Assistant")
         self.root.geometry("1200x800")
         
+        # One set of services shared by both assistants
+        self.services = ServiceBundle()
+
         # Initialize components
         self.smart_assistant = None
         self.teacher_bot = None
@@ -103,9 +107,7 @@ class UnifiedInterface:
 
     def _show_smart_assistant(self):
         """Show only Smart Assistant."""
-        self._clear_content()
-        if not self.smart_assistant:
-            self.smart_assistant = EnhancedSmartAssistant(self.content_frame)
+        self._show_assistants(smart=True, bot=False)
         
         self.current_view = "smart"
         self.status_var.set("Using Smart Assistant mode")
@@ -114,9 +116,7 @@ class UnifiedInterface:
 
     def _show_teacher_bot(self):
         """Show only Teacher Bot."""
-        self._clear_content()
-        if not self.teacher_bot:
-            self.teacher_bot = TeacherAssistantBot(self.content_frame)
+        self._show_assistants(smart=False, bot=True)
         
         self.current_view = "bot"
         self.status_var.set("Using Chat Assistant mode")
@@ -125,30 +125,42 @@ class UnifiedInterface:
 
     def _show_both(self):
         """Show both assistants side by side."""
-        self._clear_content()
-        
-        # Create left and right frames
-        left_frame = ttk.Frame(self.content_frame)
-        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        
-        right_frame = ttk.Frame(self.content_frame)
-        right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
-
-        # Initialize both assistants if needed
-        if not self.smart_assistant:
-            self.smart_assistant = EnhancedSmartAssistant(left_frame)
-        if not self.teacher_bot:
-            self.teacher_bot = TeacherAssistantBot(right_frame)
+        self._show_assistants(smart=True, bot=True)
 
         self.current_view = "both"
         self.status_var.set("Using both assistants - They'll work together!")
         self._update_buttons()
         self._save_preferences()
 
-    def _clear_content(self):
-        """Clear current content."""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def _show_assistants(self, smart: bool, bot: bool):
+        """Show the chosen assistants and hide the others.
+
+        Assistants are built once and kept alive across mode switches, so
+        chat history and running work survive; a window the user closed
+        is rebuilt.
+        """
+        if smart:
+            if not self._is_alive(self.smart_assistant):
+                self.smart_assistant = EnhancedSmartAssistant(self.content_frame, services=self.services)
+            else:
+                self.smart_assistant.window.deiconify()
+        elif self._is_alive(self.smart_assistant):
+            self.smart_assistant.window.withdraw()
+
+        if bot:
+            if not self._is_alive(self.teacher_bot):
+                self.teacher_bot = TeacherAssistantBot(self.content_frame, services=self.services)
+            else:
+                self.teacher_bot.window.deiconify()
+        elif self._is_alive(self.teacher_bot):
+            self.teacher_bot.window.withdraw()
+
+    def _is_alive(self, assistant) -> bool:
+        """Whether an assistant exists and its window is still open."""
+        try:
+            return assistant is not None and bool(assistant.window.winfo_exists())
+        except tk.TclError:
+            return False
 
     def _update_buttons(self):
         """Update button states."""
@@ -199,8 +211,8 @@ class UnifiedInterface:
 
     def destroy(self):
         """Clean up resources."""
-        if self.smart_assistant:
+        if self._is_alive(self.smart_assistant):
             self.smart_assistant.destroy()
-        if self.teacher_bot:
+        if self._is_alive(self.teacher_bot):
             self.teacher_bot.destroy()
         self.root.destroy() 
\ No newline at end of file
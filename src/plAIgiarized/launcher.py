@@ -1,13 +1,22 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import json
+import os
+import queue
+import threading
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from .core.smart_orchestrator import SmartOrchestrator
 from .logging.service import LoggingService
 
+# Tkinter and the orchestrator (with its analysis stack) are imported in
+# the methods that use them, so importing this module stays cheap
+
 class SystemLauncher:
+    # How often the launcher checks whether the orchestrator has loaded
+    LOAD_POLL_MS = 100
+
     def __init__(self):
+        import tkinter as tk
+
         self.logger = LoggingService()
         
         # Create launcher window
@@ -19,11 +28,16 @@ class SystemLauncher:
         self.profiles_path = Path("data/profiles")
         self.profiles_path.mkdir(parents=True, exist_ok=True)
         self.profiles = self._load_profiles()
+        self._prefs: Optional[dict] = None
+        self._starting = False
         
         self._create_interface()
 
     def _create_interface(self):
         """Create simple launcher interface."""
+        import tkinter as tk
+        from tkinter import ttk
+
         # Main container
         main = ttk.Frame(self.root, padding="20")
         main.pack(fill=tk.BOTH, expand=True)
@@ -115,6 +129,11 @@ class SystemLauncher:
 
     def _quick_start(self):
         """Start system with selected profile."""
+        from tkinter import messagebox
+
+        if self._starting:
+            return
+
         try:
             profile_name = self.profile_var.get()
             if not profile_name:
@@ -130,11 +149,47 @@ class SystemLauncher:
             if self.autostart_var.get():
                 self._save_autostart_profile(profile_name)
 
-            # Start the system
+            # Start the system; the orchestrator module pulls in the
+            # analysis stack, so import it off the Tk thread and poll
             self.status_var.set("Starting system...")
-            self.root.update()
-            
-            orchestrator = SmartOrchestrator(profile["id"])
+            self._starting = True
+            loaded = queue.Queue()
+
+            def load():
+                try:
+                    from .core.smart_orchestrator import SmartOrchestrator
+                    loaded.put((SmartOrchestrator, None))
+                except Exception as e:
+                    loaded.put((None, e))
+
+            threading.Thread(target=load, daemon=True).start()
+            self.root.after(self.LOAD_POLL_MS, self._poll_orchestrator, loaded, profile)
+
+        except Exception as e:
+            self._starting = False
+            self.logger.error("Error starting system", e)
+            messagebox.showerror(
+                "Start Error",
+                "Could not start the system. Please try again."
+            )
+
+    def _poll_orchestrator(self, loaded: queue.Queue, profile: dict):
+        """Launch the orchestrator once its import has finished."""
+        from tkinter import messagebox
+
+        try:
+            orchestrator_class, error = loaded.get_nowait()
+        except queue.Empty:
+            self.root.after(self.LOAD_POLL_MS, self._poll_orchestrator, loaded, profile)
+            return
+
+        try:
+            if error is not None:
+                raise error
+
+            # The orchestrator builds Tk windows, so it is created here on
+            # the main thread
+            orchestrator = orchestrator_class(profile["id"])
             
             # Hide launcher
             self.root.withdraw()
@@ -146,6 +201,8 @@ class SystemLauncher:
             self.root.destroy()
 
         except Exception as e:
+            self._starting = False
+            self.status_var.set("Ready to start")
             self.logger.error("Error starting system", e)
             messagebox.showerror(
                 "Start Error",
@@ -154,6 +211,9 @@ class SystemLauncher:
 
     def _create_profile(self):
         """Show profile creation dialog."""
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
         dialog = tk.Toplevel(self.root)
         dialog.title("Create Profile")
         dialog.geometry("300x400")
@@ -221,7 +281,7 @@ class SystemLauncher:
 
             # Save profile
             self.profiles[name] = profile
-            self._save_profiles()
+            self._save_profiles(profile)
 
             # Update interface
             if hasattr(self, 'profile_var'):
@@ -241,56 +301,113 @@ class SystemLauncher:
         ).pack(pady=20)
 
     def _load_profiles(self) -> dict:
-        """Load saved profiles."""
+        """Load saved profiles.
+
+        Profiles are stored one JSON object per line and appended on save;
+        the last line for a name wins.
+        """
+        self._profile_records = 0
         try:
-            profile_file = self.profiles_path / "profiles.json"
-            if profile_file.exists():
-                with open(profile_file, 'r') as f:
-                    return json.load(f)
-            return {}
+            profile_file = self.profiles_path / "profiles.ndjson"
+            if not profile_file.exists():
+                return self._migrate_profiles()
+
+            profiles = {}
+            damaged = False
+            for line in profile_file.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    profile = json.loads(line)
+                except ValueError:
+                    # A save interrupted mid-line; earlier records still count
+                    self.logger.warning("Skipping unreadable profile record")
+                    damaged = True
+                    continue
+                profiles[profile["name"]] = profile
+                self._profile_records += 1
+
+            # Drop the broken record so later appends start on a clean line
+            if damaged:
+                self._compact_profiles(profiles)
+            return profiles
 
         except Exception as e:
             self.logger.error("Error loading profiles", e)
             return {}
 
-    def _save_profiles(self):
-        """Save profiles to file."""
+    def _migrate_profiles(self) -> dict:
+        """Convert a legacy profiles.json into the line-based store."""
+        legacy_file = self.profiles_path / "profiles.json"
+        if not legacy_file.exists():
+            return {}
+        profiles = json.loads(legacy_file.read_bytes())
+        self._compact_profiles(profiles)
+        return profiles
+
+    def _save_profiles(self, profile: dict):
+        """Append a new or changed profile to the profile store."""
         try:
-            profile_file = self.profiles_path / "profiles.json"
-            with open(profile_file, 'w') as f:
-                json.dump(self.profiles, f, indent=2)
+            with open(self.profiles_path / "profiles.ndjson", 'a', encoding="utf-8") as f:
+                f.write(json.dumps(profile) + "\n")
+            self._profile_records += 1
+
+            # Rewrite without superseded records once they dominate
+            if self._profile_records > 2 * len(self.profiles):
+                self._compact_profiles(self.profiles)
 
         except Exception as e:
             self.logger.error("Error saving profiles", e)
 
+    def _compact_profiles(self, profiles: dict):
+        """Rewrite the profile store with one record per profile."""
+        self._write_text(
+            self.profiles_path / "profiles.ndjson",
+            "".join(json.dumps(profile) + "\n" for profile in profiles.values())
+        )
+        self._profile_records = len(profiles)
+
+    def _write_json(self, path: Path, data: dict):
+        """Write JSON in one call, replacing the file atomically."""
+        self._write_text(path, json.dumps(data, indent=2))
+
+    def _write_text(self, path: Path, text: str):
+        """Write text in one call, replacing the file atomically."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
     def _save_autostart_profile(self, profile_name: str):
         """Save auto-start profile preference."""
         try:
             prefs_file = self.profiles_path / "preferences.json"
             prefs = {"autostart_profile": profile_name}
-            
-            with open(prefs_file, 'w') as f:
-                json.dump(prefs, f, indent=2)
+            self._write_json(prefs_file, prefs)
+            self._prefs = prefs
 
         except Exception as e:
             self.logger.error("Error saving preferences", e)
 
+    def _load_preferences(self) -> dict:
+        """Load launcher preferences, reading the file only once."""
+        if self._prefs is None:
+            prefs_file = self.profiles_path / "preferences.json"
+            try:
+                self._prefs = json.loads(prefs_file.read_bytes())
+            except FileNotFoundError:
+                self._prefs = {}
+        return self._prefs
+
     def run(self):
         """Start the launcher."""
         try:
             # Check for auto-start profile
-            prefs_file = self.profiles_path / "preferences.json"
-            if prefs_file.exists():
-                with open(prefs_file, 'r') as f:
-                    prefs = json.load(f)
-                    auto_profile = prefs.get("autostart_profile")
-                    
-                    if auto_profile and auto_profile in self.profiles:
-                        self.profile_var.set(auto_profile)
-                        self._quick_start()
-                        return
-
-            # Show launcher
+            auto_profile = self._load_preferences().get("autostart_profile")
+            if auto_profile and auto_profile in self.profiles:
+                self.profile_var.set(auto_profile)
+                self._quick_start()
+
+            # Show launcher; an auto-start continues from its event loop
             self.root.mainloop()
 
         except Exception as e:
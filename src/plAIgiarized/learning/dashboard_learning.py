@@ -1,22 +1,50 @@
 import tkinter as tk
 from typing import Dict, List, Optional
+import numpy as np
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import takewhile
 from ..learning.teacher_preferences import TeacherPreferencesService
 from ..interface.adaptive_dashboard import AdaptiveDashboard
 from ..logging.service import LoggingService
 
+# Layout change per suggestion type: (action, suggestion field it applies to)
+_LAYOUT_ACTIONS = {
+    "time_based": ("promote", "widget"),       # Promote widget to more prominent position
+    "group_based": ("group", "widgets"),       # Keep widgets together
+    "context_based": ("highlight", "widget"),  # Highlight widget
+}
+
+@lru_cache(maxsize=128)
+def _make_context_key(class_id, assignment_type) -> str:
+    """Context key for a class/assignment pair; repeats share one string."""
+    return f"{class_id}:{assignment_type}"
+
 class DashboardLearningService:
+    # Suggestion types scored in _analyze_patterns, in tie-break order:
+    # (type, count giving full confidence, reason)
+    SUGGESTION_KINDS = (
+        ("time_based", 10, "frequently used at this time"),
+        ("context_based", 5, "commonly used in this context"),
+        ("group_based", 5, "often used together"),
+    )
+    # Initial widget/context slots in the count arrays; doubled as needed
+    INITIAL_CAPACITY = 16
+    # Background pattern checks run every 5 minutes, backing off to 20
+    # while nothing new has been learned
+    PATTERN_CHECK_MS = 300000
+    PATTERN_CHECK_MAX_MS = 1200000
+
     def __init__(self, teacher_id: str):
         self.logger = LoggingService()
         self.teacher_id = teacher_id
         self.preferences = TeacherPreferencesService()
         
-        # Initialize learning patterns
+        # Initialize learning patterns; usage counts by hour, context and
+        # widget pair live in the count arrays below
         self.patterns = {
-            "time_of_day": {},      # When teacher uses specific features
-            "task_sequences": [],    # Common sequences of actions
-            "widget_groups": {},     # Which widgets are used together
-            "context_actions": {},   # Actions based on class/assignment context
+            "task_sequences": deque(),  # Common sequences of actions, oldest first
             "peak_usage_times": {},  # Busiest times for different tasks
         }
         
@@ -28,35 +56,50 @@ class DashboardLearningService:
             "max_suggestions": 3,           # Max simultaneous adaptations
         }
 
+        # Usage counts by hour, context and widget pair, kept as arrays for
+        # vectorized scoring: widgets and context keys map to column/row
+        # indices in first-seen order
+        self._widget_ids: Dict[str, int] = {}
+        self._widget_names: List[str] = []
+        self._context_ids: Dict[str, int] = {}
+        capacity = self.INITIAL_CAPACITY
+        self._tod_counts = np.zeros((24, capacity), dtype=np.int32)
+        self._ctx_counts = np.zeros((capacity, capacity), dtype=np.int32)
+        self._group_counts = np.zeros((capacity, capacity), dtype=np.int32)
+        # Widget pairs whose count has reached the occurrence threshold, as
+        # parallel row/column lists; counts only grow, so pairs never leave
+        self._hot_group_threshold = self.settings["min_pattern_occurrences"]
+        self._hot_group_rows: List[int] = []
+        self._hot_group_cols: List[int] = []
+
+        # Set when interactions arrive; background checks skip analysis
+        # while clear and the hour is unchanged
+        self._dirty = False
+        # Interactions learned so far; with the hour and context it keys
+        # the last _analyze_patterns result
+        self._interaction_counter = 0
+        self._analysis_cache = None
+        self._last_check_hour = None
+        self._pattern_check_ms = self.PATTERN_CHECK_MS
+
     def connect_dashboard(self, dashboard: AdaptiveDashboard):
         """Connect to dashboard and start learning."""
         self.dashboard = dashboard
         
-        # Enhance dashboard tracking
-        self._enhance_widget_tracking()
+        # Learn from every tracked widget use
+        self.dashboard.add_observer(self.on_widget_use)
         self._enhance_layout_learning()
         self._start_pattern_detection()
 
-    def _enhance_widget_tracking(self):
-        """Enhance dashboard widget tracking with context."""
-        original_track = self.dashboard._track_usage
-
-        def enhanced_track(widget_name: str):
-            # Get current context
-            context = self._get_current_context()
-            
-            # Track in dashboard
-            original_track(widget_name)
-            
-            # Learn from interaction
-            self.learn_interaction({
-                "type": "widget_use",
-                "widget": widget_name,
-                "context": context,
-                "timestamp": datetime.now().isoformat()
-            })
-
-        self.dashboard._track_usage = enhanced_track
+    def on_widget_use(self, widget_name: str):
+        """Learn from a widget use reported by the dashboard."""
+        now = datetime.now()
+        self.learn_interaction({
+            "type": "widget_use",
+            "widget": widget_name,
+            "context": self._get_current_context(now),
+            "timestamp": now
+        })
 
     def _enhance_layout_learning(self):
         """Enhance dashboard layout learning."""
@@ -93,42 +136,39 @@ class DashboardLearningService:
     def _update_patterns(self, interaction: Dict):
         """Update learning patterns."""
         try:
-            timestamp = datetime.fromisoformat(interaction["timestamp"])
+            # Tracked uses pass a datetime; ISO strings are still accepted
+            timestamp = interaction["timestamp"]
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            context_key = self._get_context_key(interaction["context"])
             
             # Update time of day patterns
             hour = timestamp.hour
-            if hour not in self.patterns["time_of_day"]:
-                self.patterns["time_of_day"][hour] = {}
-            
             widget = interaction["widget"]
-            if widget not in self.patterns["time_of_day"][hour]:
-                self.patterns["time_of_day"][hour][widget] = 0
-            self.patterns["time_of_day"][hour][widget] += 1
+            widget_id = self._widget_index(widget)
+            self._tod_counts[hour, widget_id] += 1
 
             # Update task sequences
             self.patterns["task_sequences"].append({
                 "widget": widget,
-                "context": interaction["context"],
+                "context_key": context_key,
                 "timestamp": timestamp
             })
             
-            # Maintain sequence window
+            # Maintain sequence window; entries arrive in time order, so
+            # expired ones are all at the front
             cutoff = datetime.now() - timedelta(days=self.settings["learning_window"])
-            self.patterns["task_sequences"] = [
-                seq for seq in self.patterns["task_sequences"]
-                if seq["timestamp"] > cutoff
-            ]
+            task_sequences = self.patterns["task_sequences"]
+            while task_sequences and task_sequences[0]["timestamp"] <= cutoff:
+                task_sequences.popleft()
 
             # Update widget groups
             self._update_widget_groups(widget, timestamp)
             
             # Update context actions
-            context_key = self._get_context_key(interaction["context"])
-            if context_key not in self.patterns["context_actions"]:
-                self.patterns["context_actions"][context_key] = {}
-            if widget not in self.patterns["context_actions"][context_key]:
-                self.patterns["context_actions"][context_key][widget] = 0
-            self.patterns["context_actions"][context_key][widget] += 1
+            self._ctx_counts[self._context_index(context_key), widget_id] += 1
+            self._dirty = True
+            self._interaction_counter += 1
 
         except Exception as e:
             self.logger.error("Error updating patterns", e)
@@ -136,67 +176,138 @@ class DashboardLearningService:
     def _update_widget_groups(self, current_widget: str, timestamp: datetime):
         """Update widget group patterns."""
         try:
-            # Look for widgets used within 5 minutes
+            # Look for widgets used within 5 minutes; sequences are in
+            # arrival order, so walk back from the newest and stop at the
+            # first one outside the window
+            window_start = timestamp - timedelta(seconds=300)
             recent_sequences = [
-                seq for seq in self.patterns["task_sequences"]
-                if abs((seq["timestamp"] - timestamp).total_seconds()) <= 300
-                and seq["widget"] != current_widget
+                seq for seq in takewhile(
+                    lambda seq: seq["timestamp"] >= window_start,
+                    reversed(self.patterns["task_sequences"])
+                )
+                if seq["widget"] != current_widget
             ]
             
+            current_id = self._widget_index(current_widget)
             for seq in recent_sequences:
-                group_key = tuple(sorted([current_widget, seq["widget"]]))
-                if group_key not in self.patterns["widget_groups"]:
-                    self.patterns["widget_groups"][group_key] = 0
-                self.patterns["widget_groups"][group_key] += 1
+                other_id = self._widget_index(seq["widget"])
+                row, col = min(current_id, other_id), max(current_id, other_id)
+                self._group_counts[row, col] += 1
+                if self._group_counts[row, col] == self._hot_group_threshold:
+                    self._hot_group_rows.append(row)
+                    self._hot_group_cols.append(col)
 
         except Exception as e:
             self.logger.error("Error updating widget groups", e)
 
+    def _widget_index(self, widget: str) -> int:
+        """Array column for a widget, growing the count arrays as needed."""
+        index = self._widget_ids.get(widget)
+        if index is None:
+            index = len(self._widget_names)
+            self._widget_ids[widget] = index
+            self._widget_names.append(widget)
+            if index >= self._tod_counts.shape[1]:
+                grow = self._tod_counts.shape[1]
+                self._tod_counts = np.pad(self._tod_counts, ((0, 0), (0, grow)))
+                self._ctx_counts = np.pad(self._ctx_counts, ((0, 0), (0, grow)))
+                self._group_counts = np.pad(self._group_counts, ((0, grow), (0, grow)))
+        return index
+
+    def _context_index(self, context_key: str) -> int:
+        """Array row for a context key, growing the context counts as needed."""
+        index = self._context_ids.get(context_key)
+        if index is None:
+            index = len(self._context_ids)
+            self._context_ids[context_key] = index
+            if index >= self._ctx_counts.shape[0]:
+                self._ctx_counts = np.pad(self._ctx_counts, ((0, self._ctx_counts.shape[0]), (0, 0)))
+        return index
+
+    def _rebuild_hot_groups(self, threshold: int):
+        """Recollect widget pairs at or above a changed threshold."""
+        n = len(self._widget_names)
+        rows, cols = np.nonzero(self._group_counts[:n, :n] >= threshold)
+        self._hot_group_threshold = threshold
+        self._hot_group_rows = rows.tolist()
+        self._hot_group_cols = cols.tolist()
+
     def _analyze_patterns(self) -> List[Dict]:
         """Analyze patterns for layout suggestions."""
         suggestions = []
-        current_hour = datetime.now().hour
-        current_context = self._get_current_context()
+        now = datetime.now()
+        current_hour = now.hour
+        current_context = self._get_current_context(now)
+        context_key = self._get_context_key(current_context)
+
+        # Nothing learned and nothing moved since the last pass
+        cache_key = (
+            current_hour, context_key, self._interaction_counter,
+            self.settings["min_pattern_occurrences"], self.settings["max_suggestions"]
+        )
+        if self._analysis_cache and self._analysis_cache[0] == cache_key:
+            return list(self._analysis_cache[1])
         
         try:
-            # Check time-based patterns
-            if current_hour in self.patterns["time_of_day"]:
-                time_patterns = self.patterns["time_of_day"][current_hour]
-                for widget, count in time_patterns.items():
-                    if count >= self.settings["min_pattern_occurrences"]:
-                        suggestions.append({
-                            "type": "time_based",
-                            "widget": widget,
-                            "confidence": min(count / 10, 1.0),  # Cap at 1.0
-                            "reason": "frequently used at this time"
-                        })
-
-            # Check context patterns
-            context_key = self._get_context_key(current_context)
-            if context_key in self.patterns["context_actions"]:
-                context_patterns = self.patterns["context_actions"][context_key]
-                for widget, count in context_patterns.items():
-                    if count >= self.settings["min_pattern_occurrences"]:
-                        suggestions.append({
-                            "type": "context_based",
-                            "widget": widget,
-                            "confidence": min(count / 5, 1.0),
-                            "reason": "commonly used in this context"
-                        })
-
-            # Check widget groups
-            for (widget1, widget2), count in self.patterns["widget_groups"].items():
-                if count >= self.settings["min_pattern_occurrences"]:
-                    suggestions.append({
-                        "type": "group_based",
-                        "widgets": [widget1, widget2],
-                        "confidence": min(count / 5, 1.0),
-                        "reason": "often used together"
-                    })
-
-            # Sort by confidence and limit
-            suggestions.sort(key=lambda x: x["confidence"], reverse=True)
-            return suggestions[:self.settings["max_suggestions"]]
+            n = len(self._widget_names)
+            min_occurrences = self.settings["min_pattern_occurrences"]
+
+            # Candidate rows per suggestion type: widget index (and partner
+            # widget index for groups) plus occurrence count
+            time_counts = self._tod_counts[current_hour, :n]
+            time_ids = np.flatnonzero(time_counts >= min_occurrences)
+
+            context_id = self._context_ids.get(context_key)
+            if context_id is not None:
+                context_counts = self._ctx_counts[context_id, :n]
+                context_ids = np.flatnonzero(context_counts >= min_occurrences)
+            else:
+                context_counts = time_counts[:0]
+                context_ids = time_ids[:0]
+
+            if self._hot_group_threshold != min_occurrences:
+                self._rebuild_hot_groups(min_occurrences)
+            group_a = np.array(self._hot_group_rows, dtype=np.intp)
+            group_b = np.array(self._hot_group_cols, dtype=np.intp)
+            group_counts = self._group_counts
+
+            candidates = (
+                (time_ids, time_ids, time_counts[time_ids]),
+                (context_ids, context_ids, context_counts[context_ids]),
+                (group_a, group_b, group_counts[group_a, group_b]),
+            )
+            kinds = np.concatenate([
+                np.full(len(counts), kind) for kind, (_, _, counts) in enumerate(candidates)
+            ])
+            firsts = np.concatenate([first for first, _, _ in candidates])
+            seconds = np.concatenate([second for _, second, _ in candidates])
+            full_counts = np.array([full for _, full, _ in self.SUGGESTION_KINDS], dtype=np.float64)
+            confidences = np.minimum(
+                np.concatenate([counts for _, _, counts in candidates]) / full_counts[kinds],
+                1.0
+            )
+
+            # Top suggestions by confidence; ties keep candidate order
+            limit = min(self.settings["max_suggestions"], len(confidences))
+            if limit == 0:
+                return []
+            top = np.argpartition(-confidences, limit - 1)[:limit]
+            top = top[np.lexsort((top, -confidences[top]))]
+
+            for i in top:
+                kind, _, reason = self.SUGGESTION_KINDS[kinds[i]]
+                suggestion = {"type": kind}
+                if kind == "group_based":
+                    suggestion["widgets"] = sorted(
+                        [self._widget_names[firsts[i]], self._widget_names[seconds[i]]]
+                    )
+                else:
+                    suggestion["widget"] = self._widget_names[firsts[i]]
+                suggestion["confidence"] = float(confidences[i])
+                suggestion["reason"] = reason
+                suggestions.append(suggestion)
+            self._analysis_cache = (cache_key, suggestions)
+            return list(suggestions)
 
         except Exception as e:
             self.logger.error("Error analyzing patterns", e)
@@ -205,33 +316,15 @@ class DashboardLearningService:
     def _apply_pattern_suggestions(self, patterns: List[Dict]):
         """Apply pattern-based suggestions to dashboard."""
         try:
+            threshold = self.settings["adaptation_threshold"]
             layout_changes = []
-            
             for pattern in patterns:
-                if pattern["confidence"] >= self.settings["adaptation_threshold"]:
-                    if pattern["type"] == "time_based":
-                        # Promote widget to more prominent position
-                        layout_changes.append({
-                            "widget": pattern["widget"],
-                            "action": "promote",
-                            "reason": pattern["reason"]
-                        })
-                    
-                    elif pattern["type"] == "group_based":
-                        # Keep widgets together
-                        layout_changes.append({
-                            "widgets": pattern["widgets"],
-                            "action": "group",
-                            "reason": pattern["reason"]
-                        })
-                    
-                    elif pattern["type"] == "context_based":
-                        # Highlight widget
-                        layout_changes.append({
-                            "widget": pattern["widget"],
-                            "action": "highlight",
-                            "reason": pattern["reason"]
-                        })
+                if pattern["confidence"] < threshold or pattern["type"] not in _LAYOUT_ACTIONS:
+                    continue
+                action, field = _LAYOUT_ACTIONS[pattern["type"]]
+                layout_changes.append(
+                    {field: pattern[field], "action": action, "reason": pattern["reason"]}
+                )
 
             # Apply changes if any
             if layout_changes:
@@ -240,35 +333,48 @@ class DashboardLearningService:
         except Exception as e:
             self.logger.error("Error applying pattern suggestions", e)
 
-    def _get_current_context(self) -> Dict:
-        """Get current dashboard context."""
+    def _get_current_context(self, now: Optional[datetime] = None) -> Dict:
+        """Get current dashboard context, as of now unless given."""
+        now = now or datetime.now()
         return {
             "class_id": self.dashboard.current_class,
             "assignment_type": self.dashboard.current_assignment_type,
-            "time_of_day": datetime.now().hour,
-            "day_of_week": datetime.now().weekday()
+            "time_of_day": now.hour,
+            "day_of_week": now.weekday()
         }
 
     def _get_context_key(self, context: Dict) -> str:
         """Generate consistent key for context."""
-        return f"{context.get('class_id')}:{context.get('assignment_type')}"
+        return _make_context_key(context.get("class_id"), context.get("assignment_type"))
 
     def _start_pattern_detection(self):
         """Start background pattern detection."""
         def check_patterns():
             try:
-                # Analyze current patterns
-                patterns = self._analyze_patterns()
-                
-                # Apply if significant changes found
-                if patterns:
-                    self._apply_pattern_suggestions(patterns)
-                
-                # Schedule next check
-                self.dashboard.window.after(300000, check_patterns)  # Every 5 minutes
+                # Time-based suggestions change with the hour even without
+                # new interactions
+                hour = datetime.now().hour
+                if self._dirty or hour != self._last_check_hour:
+                    self._dirty = False
+                    self._last_check_hour = hour
+                    self._pattern_check_ms = self.PATTERN_CHECK_MS
+
+                    # Analyze current patterns
+                    patterns = self._analyze_patterns()
+                    
+                    # Apply if significant changes found
+                    if patterns:
+                        self._apply_pattern_suggestions(patterns)
+                else:
+                    self._pattern_check_ms = min(
+                        self._pattern_check_ms * 2, self.PATTERN_CHECK_MAX_MS
+                    )
 
             except Exception as e:
                 self.logger.error("Error in pattern detection", e)
 
+            # Schedule next check
+            self.dashboard.window.after(self._pattern_check_ms, check_patterns)
+
         # Start initial check
         self.dashboard.window.after(1000, check_patterns) 
\ No newline at end of file
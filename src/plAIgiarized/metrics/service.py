@@ -391,7 +391,8 @@ class MetricsService:
         try:
             import psutil
             return {
-                "usage_percent": psutil.cpu_percent(interval=1),
+                # Non-blocking: usage since the previous sample
+                "usage_percent": psutil.cpu_percent(interval=None),
                 "core_count": psutil.cpu_count(),
                 "load_average": psutil.getloadavg()
             }
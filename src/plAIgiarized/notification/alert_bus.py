@@ -0,0 +1,41 @@
+from typing import Callable, Dict, List
+import threading
+from ..logging.service import LoggingService
+
+class AlertBus:
+    """In-process publish/subscribe channel for analysis events.
+
+    Services publish when new results may produce alerts; interfaces
+    subscribe instead of polling. Callbacks run on the publishing thread,
+    so GUI subscribers must marshal work back to their own thread.
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Register a callback for published events."""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Dict], None]) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: Dict) -> None:
+        """Deliver an event to every subscriber."""
+        with self._lock:
+            subscribers = tuple(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("Error delivering alert event", e)
+
+# Shared bus for the process
+alert_bus = AlertBus()
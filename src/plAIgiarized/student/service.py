@@ -6,6 +6,7 @@ import numpy as np
 from ..logging.service import LoggingService
 from ..database.service import DatabaseService
 from ..analysis.service import AnalysisService
+from ..notification.alert_bus import alert_bus
 
 class StudentProgressService:
     def __init__(self):
@@ -53,6 +54,14 @@ class StudentProgressService:
             self.logger.error(f"Error setting baseline for student {student_id}", e)
             return False
 
+    def get_baselines(self, student_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """Get baselines for several students with one database query.
+
+        Students without a stored baseline map to None.
+        """
+        found = self.db.get_student_baselines(student_ids)
+        return {student_id: found.get(student_id) for student_id in student_ids}
+
     def analyze_progress(self, student_id: str, new_essay_id: str) -> Dict:
         """Analyze student's progress compared to their baseline."""
         try:
@@ -84,6 +93,12 @@ class StudentProgressService:
 
             # Store progress report
             self.db.store_progress_report(progress)
+            alert_bus.publish({
+                "type": "progress_analyzed",
+                "student_id": student_id,
+                "essay_id": new_essay_id,
+                "anomalies": progress["anomalies"]
+            })
 
             return progress
 